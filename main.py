@@ -155,36 +155,28 @@ def run_scraper_command_cli(args):
         return
     first_meter = configured_meters[0]
     logger.info(f"Starting scraper via CLI command for first meter: {first_meter['meter_id']}")
-    db_manager.initialize_db_pool()
-    try:
+    with db_manager.pool_scope():
         scraper.main(
             meter_id=first_meter['meter_id'],
             meter_number=first_meter['meter_number'],
             meter_no=first_meter['meter_no']
         )
-    finally:
-        db_manager.close_db_pool()
 
 def run_simulation_command(args):
-    db_manager.initialize_db_pool()
-    try:
+    with db_manager.pool_scope():
         twin = DigitalTwin(meter_id=args.meter_id)
         twin.run_simulation(
             simulation_duration_hours=args.duration_hours,
             prediction_horizon_hours=args.duration_hours,
             model_name=args.model,
-            data_for_training_hours=args.training_hours
+            data_for_training_hours=args.training_hours,
+            include_actuals=False # The CLI only stores the run, so let PostgreSQL join the actuals
         )
-    finally:
-        db_manager.close_db_pool()
 
 def setup_db_command(args):
-    db_manager.initialize_db_pool()
-    try:
+    with db_manager.pool_scope():
         db_manager.create_tables()
         logger.info("Database setup complete.")
-    finally:
-        db_manager.close_db_pool()
 
 # --- Main API Server Function ---
 def run_api_server_command(args):
@@ -10,6 +10,13 @@ logger = logging.getLogger(__name__)
 # main.py handles global logging setup, so no specific handlers here.
 # This logger will inherit from the root logger configured in main.py.
 
+# The application timezone is fixed at import, so resolve it once rather than per request
+_APP_TZ = db_manager.get_timezone()
+
+# Historical windows served to the dashboard, keyed by (meter_id, hours, window end). The end is
+# rounded to the minute, so polls within the same minute share one query.
+_historical_data_cache = db_manager.TTLCache(ttl=60, maxsize=256)
+
 
 class DataAnalyzer:
     """
@@ -25,29 +32,46 @@ class DataAnalyzer:
         Retrieves the latest 'limit_count' number of real meter readings for a specific meter,
         ordered by timestamp descending (most recent first).
         """
-        logger.info(f"Fetching latest {limit_count} real readings for Meter ID: {meter_id}...")
+        logger.info("Fetching latest %d real readings for Meter ID: %s...", limit_count, meter_id)
         try:
             latest_readings = db_manager.get_latest_meter_readings_by_limit(meter_id, limit_count)
-            logger.info(f"Retrieved {len(latest_readings)} latest readings for Meter ID {meter_id}.")
+            logger.info("Retrieved %d latest readings for Meter ID %s.", len(latest_readings), meter_id)
             return latest_readings
         except Exception as e:
-            logger.error(f"Error fetching latest readings for dashboard (Meter ID {meter_id}): {e}", exc_info=True)
+            logger.error("Error fetching latest readings for dashboard (Meter ID %s): %s", meter_id, e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return []
 
+    def get_latest_readings_for_meters(self, meter_ids: List[str], limit_count: int = 20) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieves the latest 'limit_count' real meter readings for several meters in one database
+        round trip. Returns a dict keyed by meter ID, each list ordered most recent first.
+        """
+        logger.info("Fetching latest %d real readings for %d meters...", limit_count, len(meter_ids))
+        try:
+            return db_manager.get_latest_meter_readings_for_meters(meter_ids, limit_count)
+        except Exception as e:
+            logger.error("Error fetching latest readings for dashboard (Meter IDs %s): %s", meter_ids, e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            return {meter_id: [] for meter_id in meter_ids}
+
     def get_historical_data(self, meter_id: str, hours: int = 24) -> List[Dict[str, Any]]:
         """
         Retrieves historical energy consumption data for a specific meter
         for the last 'hours' number of hours.
         """
-        logger.info(f"Fetching {hours} hours of historical data for Meter ID: {meter_id}...")
+        logger.info("Fetching %d hours of historical data for Meter ID: %s...", hours, meter_id)
         try:
-            end_time = datetime.now(db_manager.get_timezone()).replace(second=0, microsecond=0)
-            start_time = end_time - timedelta(hours=hours)
-            historical_data = db_manager.get_meter_readings_in_range(meter_id, start_time, end_time)
-            logger.info(f"Retrieved {len(historical_data)} historical points for Meter ID {meter_id}.")
-            return historical_data
+            end_time = datetime.now(_APP_TZ).replace(second=0, microsecond=0)
+            cache_key = (meter_id, hours, end_time)
+            hit, historical_data = _historical_data_cache.get(cache_key)
+            if not hit:
+                start_time = end_time - timedelta(hours=hours)
+                historical_data = db_manager.get_meter_readings_in_range(meter_id, start_time, end_time)
+                if historical_data:
+                    _historical_data_cache.set(cache_key, historical_data)
+            logger.info("Retrieved %d historical points for Meter ID %s.", len(historical_data), meter_id)
+            return list(historical_data) # Shallow copy, so callers cannot reorder the cached list
         except Exception as e:
-            logger.error(f"Error fetching historical data for dashboard (Meter ID {meter_id}): {e}", exc_info=True)
+            logger.error("Error fetching historical data for dashboard (Meter ID %s): %s", meter_id, e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return []
 
     def get_latest_forecast(self, meter_id: str) -> List[Dict[str, Any]]:
@@ -55,18 +79,18 @@ class DataAnalyzer:
         Retrieves the latest forecast predictions for a given meter ID.
         This involves getting the latest forecast run and then its associated predictions.
         """
-        logger.info(f"Fetching latest forecast for Meter ID: {meter_id}...")
+        logger.info("Fetching latest forecast for Meter ID: %s...", meter_id)
         try:
             latest_run = db_manager.get_latest_forecast_run(meter_id)
             if latest_run and latest_run.get('run_id'):
                 forecast_predictions = db_manager.get_forecast_predictions(latest_run['run_id'])
-                logger.info(f"Retrieved {len(forecast_predictions)} forecast points for Meter ID {meter_id} from run {latest_run['run_id']}.")
+                logger.info("Retrieved %d forecast points for Meter ID %s from run %s.", len(forecast_predictions), meter_id, latest_run['run_id'])
                 return forecast_predictions
             else:
-                logger.warning(f"No latest forecast run found for Meter ID: {meter_id}.")
+                logger.warning("No latest forecast run found for Meter ID: %s.", meter_id)
                 return []
         except Exception as e:
-            logger.error(f"Error fetching latest forecast for dashboard (Meter ID {meter_id}): {e}", exc_info=True)
+            logger.error("Error fetching latest forecast for dashboard (Meter ID %s): %s", meter_id, e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return []
 
     def get_latest_forecast_run_details(self, meter_id: str) -> Optional[Dict[str, Any]]:
@@ -74,17 +98,17 @@ class DataAnalyzer:
         Retrieves the full details of the latest forecast run for a given meter ID,
         including MAE and RMSE.
         """
-        logger.info(f"Fetching latest forecast run details for Meter ID: {meter_id}...")
+        logger.info("Fetching latest forecast run details for Meter ID: %s...", meter_id)
         try:
             run_details = db_manager.get_latest_forecast_run(meter_id)
             if run_details:
-                logger.info(f"Retrieved latest forecast run details for Meter ID {meter_id}: Run ID {run_details.get('run_id')}.")
+                logger.info("Retrieved latest forecast run details for Meter ID %s: Run ID %s.", meter_id, run_details.get('run_id'))
                 return run_details
             else:
-                logger.warning(f"No latest forecast run details found for Meter ID: {meter_id}.")
+                logger.warning("No latest forecast run details found for Meter ID: %s.", meter_id)
                 return None
         except Exception as e:
-            logger.error(f"Error fetching latest forecast run details for Meter ID {meter_id}: {e}", exc_info=True)
+            logger.error("Error fetching latest forecast run details for Meter ID %s: %s", meter_id, e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return None
 
 
@@ -95,10 +119,10 @@ class DataAnalyzer:
         logger.info("Fetching all meter details...")
         try:
             all_meters = db_manager.get_all_meter_details()
-            logger.info(f"Retrieved {len(all_meters)} meter details.")
+            logger.info("Retrieved %d meter details.", len(all_meters))
             return all_meters
         except Exception as e:
-            logger.error(f"Error fetching all meter details: {e}", exc_info=True)
+            logger.error("Error fetching all meter details: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return []
 
 
@@ -167,13 +191,8 @@ if __name__ == '__main__':
 
 
     except Exception as e:
-        logger.error(f"Error during standalone DataAnalyzer test: {e}", exc_info=True)
+        logger.error("Error during standalone DataAnalyzer test: %s", e, exc_info=True)
     finally:
-        try:
-            if db_manager.DB_POOL:
-                db_manager.close_db_pool()
-                logger.info("Database connection pool closed.")
-        except Exception as e:
-            logger.error(f"Error closing DB pool: {e}")
+        db_manager.close_db_pool() # No-op if the pool was never created; logs its own errors
         logger.info("Standalone DataAnalyzer test finished.")
 
@@ -1,13 +1,23 @@
+import bisect
+import csv
+import io
+import itertools
 import logging
+import logging.handlers
+import operator
 import os
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from configparser import ConfigParser
-from psycopg2 import pool
-from psycopg2.extras import DictCursor
+from psycopg2 import pool, extensions
+from psycopg2.extras import execute_values
 from psycopg2 import sql
 import pytz
 import uuid
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from zoneinfo import ZoneInfo
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Sequence, Tuple
 from decimal import Decimal # Import Decimal for conversion
 
 # --- Logging Setup for db_manager ---
@@ -21,14 +31,18 @@ logger.setLevel(logging.INFO)
 
 # Prevent adding duplicate handlers if they already exist (e.g., from multiple imports)
 if not logger.handlers:
-    fh = logging.FileHandler(log_file)
+    # delay=True defers opening the file until the first record is actually written
+    fh = logging.handlers.RotatingFileHandler(log_file, maxBytes=10 * 1024 * 1024, backupCount=5, delay=True)
     fh.setLevel(logging.INFO)
     ch = logging.StreamHandler()
     ch.setLevel(logging.INFO)
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     fh.setFormatter(formatter)
     ch.setFormatter(formatter) # Corrected this line in the previous response
-    logger.addHandler(fh)
+    # Buffer file writes; flushed every 1000 records, on WARNING and above, and at interpreter shutdown
+    mh = logging.handlers.MemoryHandler(capacity=1000, flushLevel=logging.WARNING, target=fh)
+    mh.setLevel(logging.INFO)
+    logger.addHandler(mh)
     logger.addHandler(ch)
     logger.info("db_manager logging handlers added.")
 else:
@@ -37,24 +51,240 @@ else:
 
 # --- Global Database Pool and Configuration ---
 DB_POOL = None
+# Pool sizing defaults, overridable via pool_min / pool_max / pool_timeout in [Database]
+DEFAULT_POOL_MIN = 4
+DEFAULT_POOL_MAX = 32
+DEFAULT_POOL_TIMEOUT_SECONDS = 10.0
+DB_POOL_TIMEOUT_SECONDS = DEFAULT_POOL_TIMEOUT_SECONDS
+# Server-side actuals are joined to predictions by slot of this many seconds since the epoch
+# (the first reading in a prediction's slot), like DigitalTwin's client-side alignment
+ACTUALS_SLOT_SECONDS = 15 * 60
+# Checkout counters for tuning the pool size (approximate under heavy concurrency)
+DB_POOL_STATS: Dict[str, int] = {'checkouts': 0, 'waits': 0, 'timeouts': 0}
+# Parsed [Database] settings keyed by (config_path, mtime_ns) so config.ini is only re-read when it changes
+_DB_CONFIG_CACHE: Dict[tuple, Dict[str, Any]] = {}
 # Define the application's default timezone (e.g., Asia/Kolkata for IST)
 APP_TIMEZONE = pytz.timezone('Asia/Kolkata')
+# zoneinfo twin of APP_TIMEZONE for hot paths: attaching it is a plain replace(), no pytz localize()
+_APP_ZONEINFO = ZoneInfo(APP_TIMEZONE.zone)
+# Last object created by create_tables(); if it exists, the schema is already up to date.
+SCHEMA_SENTINEL = 'public.readings_ts_brin'
+
+# Measurement columns of 'readings' (after meter_id and timestamp), in INSERT order.
+# Missing keys in a reading dict default to NULL.
+READING_VALUE_COLUMNS = (
+    'voltage_vrn', 'voltage_vyn', 'voltage_vbn',
+    'current_ir', 'current_iy', 'current_ib',
+    'energy_kwh_import', 'energy_kvah_import', 'energy_kwh_export', 'energy_kvah_export',
+    'network_info'
+)
+_READING_VALUE_DEFAULTS = dict.fromkeys(READING_VALUE_COLUMNS)
+_get_reading_values = operator.itemgetter(*READING_VALUE_COLUMNS)
+READING_INSERT_COLUMNS = ('meter_id', 'timestamp') + READING_VALUE_COLUMNS
+
+# TimescaleDB settings for 'readings' (only applied when the timescaledb extension is installed)
+READINGS_CHUNK_INTERVAL = '1 month'
+READINGS_COMPRESS_AFTER = '3 months'
+
+# Rows per multi-row INSERT sent by execute_values
+BULK_INSERT_PAGE_SIZE = 1000
+# Page-sized INSERT statements sent together in one round trip by _execute_values_pipelined
+BULK_INSERT_PAGES_PER_ROUNDTRIP = 10
+# Batches larger than this are loaded with COPY through a staging table instead
+COPY_THRESHOLD_ROWS = 50000
+# Rows fetched per round trip by server-side (named) cursors
+STREAM_ITERSIZE = 10000
+# Reading columns returned to forecasting and the dashboard by the range queries
+READING_FORECAST_COLUMNS = ('meter_id', 'timestamp', 'energy_kwh_import', 'voltage_vrn', 'current_ir')
+
+# Bulk INSERT statements, built once at import. They contain no dynamic identifiers, so plain
+# strings are enough and skip sql.SQL composition on every call. '%s' stands for the VALUES list.
+INSERT_READINGS_SQL = """
+    INSERT INTO readings (
+        meter_id, timestamp, voltage_vrn, voltage_vyn, voltage_vbn,
+        current_ir, current_iy, current_ib, energy_kwh_import,
+        energy_kvah_import, energy_kwh_export, energy_kvah_export, network_info
+    ) VALUES %s
+    ON CONFLICT (meter_id, timestamp) DO NOTHING;
+"""
+INSERT_READINGS_TEMPLATE = '(' + ', '.join(['%s'] * len(READING_INSERT_COLUMNS)) + ')'
+PREDICTION_INSERT_COLUMNS = ('run_id', 'timestamp', 'predicted_kwh', 'actual_kwh')
+INSERT_PREDICTIONS_SQL = """
+    INSERT INTO forecast_predictions (run_id, timestamp, predicted_kwh, actual_kwh)
+    VALUES %s
+    ON CONFLICT (run_id, timestamp) DO UPDATE SET -- Update existing predictions if conflict
+        predicted_kwh = EXCLUDED.predicted_kwh,
+        actual_kwh = EXCLUDED.actual_kwh;
+"""
+
+# Hot read queries PREPAREd once per connection (see _execute_prepared), keyed by statement name
+PREPARED_STATEMENTS = {
+    'latest_readings_by_limit': """
+        SELECT
+            reading_id, meter_id, timestamp,
+            voltage_vrn, voltage_vyn, voltage_vbn,
+            current_ir, current_iy, current_ib,
+            energy_kwh_import, energy_kvah_import, energy_kwh_export, energy_kvah_export,
+            network_info, ingestion_time
+        FROM readings
+        WHERE meter_id = $1
+        ORDER BY timestamp DESC
+        LIMIT $2
+    """,
+    'latest_forecast_run': """
+        SELECT
+            run_id, meter_id, model_name, prediction_start_time, prediction_end_time,
+            training_data_start, training_data_end, mae, rmse, run_timestamp
+        FROM forecast_runs
+        WHERE meter_id = $1
+        ORDER BY run_timestamp DESC
+        LIMIT 1
+    """,
+    'readings_range_bounds': """
+        SELECT min(timestamp), max(timestamp), count(*)
+        FROM readings
+        WHERE meter_id = $1 AND timestamp >= $2 AND timestamp <= $3
+    """,
+}
+
+class PreparingConnection(extensions.connection):
+    """
+    psycopg2 connection used by the pool. Remembers which PREPARED_STATEMENTS were prepared on it
+    and, when NUMERIC_AS_FLOAT is set, decodes NUMERIC columns straight to float.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+        if NUMERIC_AS_FLOAT:
+            # Scoped to this connection, so other psycopg2 users in the process still get Decimals
+            extensions.register_type(NUMERIC_AS_FLOAT_TYPE, self)
+
+# PostgreSQL type OID of columns that need conversion on the way out
+NUMERIC_OID = 1700
+
+def _cast_numeric_to_float(value: Optional[str], cur) -> Optional[float]:
+    """psycopg2 typecaster that parses NUMERIC wire values straight into float."""
+    return float(value) if value is not None else None
+
+# Registered on every pooled connection unless [Database] numeric_as_float = false.
+# Set numeric_as_float = false for callers that need arbitrary-precision Decimals.
+NUMERIC_AS_FLOAT_TYPE = extensions.new_type(extensions.DECIMAL.values, 'NUMERIC_AS_FLOAT', _cast_numeric_to_float)
+NUMERIC_AS_FLOAT = False
+
+
+# --- In-process caches for slowly changing lookups ---
+CACHE_TTL_SECONDS = 60
 
+class TTLCache:
+    """
+    Minimal thread-safe cache whose entries expire 'ttl' seconds (default CACHE_TTL_SECONDS)
+    after being stored. Stands in for cachetools.TTLCache without adding a dependency.
+    """
+    def __init__(self, ttl: float = CACHE_TTL_SECONDS, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Any, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Tuple[bool, Any]:
+        """Returns (True, value) for a live entry, (False, None) otherwise."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            return True, entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._entries) >= self.maxsize and key not in self._entries:
+                self._entries.clear() # Simple bound; entries are cheap to refetch
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+_meter_details_cache = TTLCache()
+_latest_forecast_run_cache = TTLCache()
+
+def cache_bust():
+    """Drops all cached meter details and latest forecast runs (e.g., after out-of-band DB changes)."""
+    _meter_details_cache.clear()
+    _latest_forecast_run_cache.clear()
+    logger.info("db_manager caches cleared.")
 
 def get_timezone() -> timezone:
     """Returns the application's configured timezone for consistency."""
     return APP_TIMEZONE
 
+def _localize_if_naive(timestamp_obj):
+    """
+    Attaches APP_TIMEZONE to naive datetimes; aware datetimes and other values pass through.
+    psycopg2 sends aware datetimes with their UTC offset and TIMESTAMPTZ columns store
+    them as UTC, so no explicit astimezone(timezone.utc) is needed before insertion.
+    """
+    if isinstance(timestamp_obj, datetime) and timestamp_obj.tzinfo is None:
+        return timestamp_obj.replace(tzinfo=_APP_ZONEINFO)
+    return timestamp_obj
+
+def _execute_prepared(cur, name: str, params: tuple):
+    """
+    Executes one of PREPARED_STATEMENTS on the cursor's connection, issuing the PREPARE on first
+    use so later calls skip server-side parsing and planning. Prepared statements live for the
+    whole session, so each pooled connection prepares a statement at most once.
+    """
+    conn = cur.connection
+    if name not in conn.prepared_statements:
+        cur.execute(f"PREPARE {name} AS {PREPARED_STATEMENTS[name]};")
+        conn.prepared_statements.add(name)
+    placeholders = ', '.join(['%s'] * len(params))
+    cur.execute(f"EXECUTE {name} ({placeholders});", params)
+
+def _iter_converted_rows(cur) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the rows of an executed (plain tuple) cursor as dicts, with NUMERIC columns converted
+    to float. Column names and the columns to convert are resolved once from cursor.description,
+    so each row costs a single dict construction rather than a DictRow plus a dict copy.
+    TIMESTAMPTZ values need no conversion: pooled connections use APP_TIMEZONE as their
+    session TimeZone, so the server already renders them in application time.
+    """
+    column_names = None
+    numeric_indexes = None
+    for row in cur:
+        if column_names is None:
+            # Named cursors only populate description after the first fetch.
+            # With the NUMERIC_AS_FLOAT typecaster active, psycopg2 already returns floats.
+            column_names = [col.name for col in cur.description]
+            numeric_indexes = [] if NUMERIC_AS_FLOAT else [i for i, col in enumerate(cur.description) if col.type_code == NUMERIC_OID]
+        if numeric_indexes:
+            row = list(row)
+            for i in numeric_indexes:
+                if row[i] is not None:
+                    row[i] = float(row[i])
+        yield dict(zip(column_names, row))
+
 def get_db_config() -> Dict[str, Any]:
-    """Reads database configuration from config.ini."""
-    config = ConfigParser()
+    """
+    Reads database configuration from config.ini.
+    The parsed result is cached until the file's modification time changes.
+    """
     # Path to config.ini, assuming it's in the project root (one level up from src/)
     config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.ini')
 
-    if not os.path.exists(config_path):
-        logger.critical(f"Config file not found at {config_path}")
+    try:
+        cache_key = (config_path, os.stat(config_path).st_mtime_ns)
+    except FileNotFoundError:
+        logger.critical("Config file not found at %s", config_path)
         raise FileNotFoundError(f"config.ini not found at {config_path}")
 
+    cached_config = _DB_CONFIG_CACHE.get(cache_key)
+    if cached_config is not None:
+        return dict(cached_config)
+
+    config = ConfigParser()
     config.read(config_path)
 
     try:
@@ -65,35 +295,78 @@ def get_db_config() -> Dict[str, Any]:
         db_user = config.get('Database', 'db_user')
         db_password = config.get('Database', 'db_password')
     except Exception as e:
-        logger.critical(f"Missing or invalid database configuration in config.ini: {e}", exc_info=True)
+        logger.critical("Missing or invalid database configuration in config.ini: %s", e, exc_info=True)
         raise ValueError("Database configuration error in config.ini. Please check the [Database] section.")
 
-    return {
+    db_config = {
         'host': db_host,
         'port': db_port,
         'database': db_name,
         'user': db_user,
         'password': db_password
     }
+    _DB_CONFIG_CACHE.clear() # Only the current version of the file is worth keeping
+    _DB_CONFIG_CACHE[cache_key] = db_config
+    return dict(db_config)
 
-def initialize_db_pool():
+def get_db_pool_config() -> Dict[str, Any]:
+    """
+    Reads optional connection pool and session settings (pool_min, pool_max, pool_timeout,
+    numeric_as_float) from the [Database] section of config.ini, falling back to the module defaults.
+    """
+    config = ConfigParser()
+    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.ini')
+    config.read(config_path)
+    try:
+        pool_min = config.getint('Database', 'pool_min', fallback=DEFAULT_POOL_MIN)
+        pool_max = config.getint('Database', 'pool_max', fallback=DEFAULT_POOL_MAX)
+        pool_timeout = config.getfloat('Database', 'pool_timeout', fallback=DEFAULT_POOL_TIMEOUT_SECONDS)
+        numeric_as_float = config.getboolean('Database', 'numeric_as_float', fallback=True)
+    except ValueError as e:
+        logger.warning("Invalid pool settings in config.ini, using defaults: %s", e)
+        pool_min, pool_max, pool_timeout = DEFAULT_POOL_MIN, DEFAULT_POOL_MAX, DEFAULT_POOL_TIMEOUT_SECONDS
+        numeric_as_float = True
+    if pool_max < pool_min:
+        logger.warning("pool_max (%d) is smaller than pool_min (%d). Using pool_min for both.", pool_max, pool_min)
+        pool_max = pool_min
+    return {'minconn': pool_min, 'maxconn': pool_max, 'timeout': pool_timeout,
+            'numeric_as_float': numeric_as_float}
+
+def initialize_db_pool(minconn: Optional[int] = None, maxconn: Optional[int] = None):
     """
     Initializes the PostgreSQL connection pool.
     This function should be called once at application startup (e.g., in main.py's init_app function
     or at the start of a standalone script's main block).
+    Uses a ThreadedConnectionPool so connections can be shared safely between threads
+    (e.g., Flask request handlers). For very high concurrency, consider PgBouncer in front of Postgres.
+    'minconn' and 'maxconn' override the configured pool size, e.g. for a small per-process pool
+    in worker processes.
     """
-    global DB_POOL
+    global DB_POOL, DB_POOL_TIMEOUT_SECONDS, NUMERIC_AS_FLOAT
     if DB_POOL is None:
         db_config = get_db_config()
+        pool_config = get_db_pool_config()
+        if minconn is not None:
+            pool_config['minconn'] = minconn
+        if maxconn is not None:
+            pool_config['maxconn'] = max(maxconn, pool_config['minconn'])
+        # Decode NUMERIC straight to float at the protocol level instead of building Decimals
+        # (applied by PreparingConnection as the pool opens its connections)
+        NUMERIC_AS_FLOAT = pool_config['numeric_as_float']
         try:
-            DB_POOL = pool.SimpleConnectionPool(
-                minconn=1,  # Minimum connections to keep open
-                maxconn=10, # Maximum connections to allow
+            DB_POOL = pool.ThreadedConnectionPool(
+                minconn=pool_config['minconn'], # Minimum connections to keep open
+                maxconn=pool_config['maxconn'], # Maximum connections to allow
+                # TIMESTAMPTZ values come back already in APP_TIMEZONE, no per-row astimezone() needed
+                options=f"-c timezone={APP_TIMEZONE.zone}",
+                connection_factory=PreparingConnection,
                 **db_config # Unpack the dictionary of database parameters
             )
-            logger.info("Database connection pool initialized successfully.")
+            DB_POOL_TIMEOUT_SECONDS = pool_config['timeout']
+            logger.info("Database connection pool initialized successfully (min=%d, max=%d).",
+                        pool_config['minconn'], pool_config['maxconn'])
         except Exception as e:
-            logger.critical(f"Failed to initialize database connection pool: {e}", exc_info=True)
+            logger.critical("Failed to initialize database connection pool: %s", e, exc_info=True)
             raise # Re-raise the exception to propagate startup failure
 
 def get_db_conn():
@@ -105,11 +378,25 @@ def get_db_conn():
         initialize_db_pool() # Call initialization if pool is None
 
     try:
-        conn = DB_POOL.getconn()
+        # An exhausted pool raises PoolError; wait with exponential backoff until DB_POOL_TIMEOUT_SECONDS
+        deadline = time.monotonic() + DB_POOL_TIMEOUT_SECONDS
+        backoff = 0.01
+        while True:
+            try:
+                conn = DB_POOL.getconn()
+                break
+            except pool.PoolError:
+                if DB_POOL.closed or time.monotonic() >= deadline:
+                    DB_POOL_STATS['timeouts'] += 1
+                    raise
+                DB_POOL_STATS['waits'] += 1
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 0.5)
+        DB_POOL_STATS['checkouts'] += 1
         conn.autocommit = False # Ensure transactions are managed explicitly
         return conn
     except Exception as e:
-        logger.error(f"Error getting connection from pool: {e}", exc_info=True)
+        logger.error("Error getting connection from pool: %s", e, exc_info=True)
         raise # Propagate connection retrieval errors
 
 def return_db_conn(conn):
@@ -123,7 +410,24 @@ def return_db_conn(conn):
             conn.rollback()
         DB_POOL.putconn(conn)
     except Exception as e:
-        logger.error(f"Error returning connection to pool: {e}", exc_info=True)
+        logger.error("Error returning connection to pool: %s", e, exc_info=True)
+
+@contextmanager
+def db_cursor(readonly: bool = False, name: Optional[str] = None):
+    """
+    Checks a connection out of the pool and yields (conn, cur), returning the connection when
+    the block exits. With readonly=True the connection runs in autocommit mode, so no BEGIN is
+    sent before the query and no ROLLBACK when the connection goes back to the pool.
+    Named (server-side) cursors need a transaction, so pass name= only with readonly=False.
+    """
+    conn = get_db_conn()
+    try:
+        if readonly:
+            conn.autocommit = True # get_db_conn() resets this on the next checkout
+        with conn.cursor(name=name) as cur:
+            yield conn, cur
+    finally:
+        return_db_conn(conn)
 
 def close_db_pool():
     """Closes all connections in the pool. Call this when application shuts down."""
@@ -134,7 +438,257 @@ def close_db_pool():
             logger.info("Database connection pool closed.")
             DB_POOL = None # Reset the global variable
         except Exception as e:
-            logger.error(f"Error closing database connection pool: {e}", exc_info=True)
+            logger.error("Error closing database connection pool: %s", e, exc_info=True)
+
+@contextmanager
+def pool_scope():
+    """
+    Initializes the connection pool for the duration of a 'with' block and closes it on exit,
+    for CLI commands and standalone scripts that own the pool's lifecycle.
+    """
+    initialize_db_pool()
+    try:
+        yield
+    finally:
+        close_db_pool()
+
+def _execute_values_pipelined(cur, query, records: Iterable[tuple], template: str,
+                              page_size: int = BULK_INSERT_PAGE_SIZE,
+                              pages_per_roundtrip: int = BULK_INSERT_PAGES_PER_ROUNDTRIP):
+    """
+    Like psycopg2.extras.execute_values, but several page-sized INSERT statements are joined
+    with ';' and sent in a single execute(), so the client does not wait for each page's result
+    before sending the next. This is the nearest psycopg2 equivalent of libpq pipeline mode.
+    The query must contain exactly one '%s' placeholder, standing for the VALUES list.
+    """
+    if isinstance(query, sql.Composable):
+        query = query.as_string(cur)
+    encoding = extensions.encodings[cur.connection.encoding]
+    head, tail = query.split('%s')
+    head = head.encode(encoding)
+    tail = tail.rstrip().rstrip(';').encode(encoding)
+
+    records = iter(records)
+    statements = []
+    while True:
+        page = list(itertools.islice(records, page_size))
+        if page:
+            statements.append(head + b','.join(cur.mogrify(template, row) for row in page) + tail)
+        if statements and (not page or len(statements) == pages_per_roundtrip):
+            cur.execute(b';'.join(statements))
+            statements = []
+        if not page:
+            break
+
+class _CsvRowStream(io.TextIOBase):
+    """
+    Read-only file object that renders rows as COPY csv text on demand, BULK_INSERT_PAGE_SIZE
+    rows at a time, as copy_expert() reads it. The batch is streamed to the server while it is
+    still being produced, instead of being rendered into one in-memory buffer first. A read
+    returns at most the rest of the current page (copy_expert() reads until it gets ''), which
+    is consumed through an offset so the page is never re-sliced.
+    """
+    def __init__(self, rows: Iterable[tuple]):
+        self._rows = iter(rows)
+        self._page = io.StringIO()
+        self._writer = csv.writer(self._page)
+        self._pending = ''
+        self._offset = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def _next_page(self) -> bool:
+        """Renders the next page of rows into self._pending; False once the rows are exhausted."""
+        page = list(itertools.islice(self._rows, BULK_INSERT_PAGE_SIZE))
+        if not page:
+            return False
+        self._page.seek(0)
+        self._page.truncate()
+        self._writer.writerows(['\\N' if value is None else value for value in row] for row in page)
+        self._pending, self._offset = self._page.getvalue(), 0
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        if size is None or size < 0:
+            chunks = [self._pending[self._offset:]]
+            while self._next_page():
+                chunks.append(self._pending)
+            self._pending, self._offset = '', 0
+            return ''.join(chunks)
+        if self._offset >= len(self._pending) and not self._next_page():
+            return ''
+        start = self._offset
+        self._offset = min(start + size, len(self._pending))
+        return self._pending[start:self._offset]
+
+def _copy_via_staging(cur, table: str, columns: Sequence[str], rows: Iterable[tuple], on_conflict: str):
+    """
+    Bulk-loads rows into `table` with COPY. COPY cannot resolve conflicts itself, so the rows
+    are streamed into a temporary staging table (dropped on commit) and then moved with a
+    single INSERT ... SELECT carrying the given ON CONFLICT clause.
+    """
+    staging = sql.Identifier(f"{table}_staging")
+    column_list = sql.SQL(', ').join(map(sql.Identifier, columns))
+    cur.execute(
+        sql.SQL("CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {columns} FROM {table} WITH NO DATA;")
+        .format(staging=staging, columns=column_list, table=sql.Identifier(table))
+    )
+
+    copy_query = sql.SQL("COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N');").format(
+        staging=staging, columns=column_list
+    )
+    cur.copy_expert(copy_query.as_string(cur), _CsvRowStream(rows))
+
+    cur.execute(
+        sql.SQL("INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} " + on_conflict + ";")
+        .format(table=sql.Identifier(table), columns=column_list, staging=staging)
+    )
+
+def _ensure_readings_hypertable(cur) -> bool:
+    """
+    Converts 'readings' into a TimescaleDB hypertable partitioned by month on 'timestamp',
+    with chunks older than READINGS_COMPRESS_AFTER compressed and segmented by meter_id.
+    Time-bounded queries then only touch the chunks covering their range.
+    Returns False and leaves the plain table untouched if TimescaleDB is not installed.
+    """
+    cur.execute("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb';")
+    if cur.fetchone() is None:
+        return False
+
+    cur.execute("SELECT 1 FROM timescaledb_information.hypertables WHERE hypertable_name = 'readings';")
+    if cur.fetchone() is not None:
+        return True
+
+    # Every unique index on a hypertable must include the partitioning column
+    cur.execute("""
+        ALTER TABLE readings DROP CONSTRAINT IF EXISTS readings_pkey;
+        ALTER TABLE readings ADD PRIMARY KEY (reading_id, timestamp);
+    """)
+    cur.execute(
+        "SELECT create_hypertable('readings', 'timestamp', chunk_time_interval => %s::interval, migrate_data => TRUE);",
+        (READINGS_CHUNK_INTERVAL,)
+    )
+    cur.execute("""
+        ALTER TABLE readings SET (
+            timescaledb.compress,
+            timescaledb.compress_segmentby = 'meter_id',
+            timescaledb.compress_orderby = 'timestamp DESC'
+        );
+    """)
+    cur.execute(
+        "SELECT add_compression_policy('readings', %s::interval, if_not_exists => TRUE);",
+        (READINGS_COMPRESS_AFTER,)
+    )
+    return True
+
+def _migrate_serial_to_identity(cur, table: str, column: str) -> bool:
+    """
+    Converts a legacy SERIAL key column into BIGINT GENERATED BY DEFAULT AS IDENTITY,
+    continuing numbering after the current maximum. Returns False if the column already
+    is an identity column. The type change rewrites the table, so it runs only once.
+    """
+    cur.execute(
+        """
+        SELECT is_identity FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = %s AND column_name = %s;
+        """,
+        (table, column)
+    )
+    row = cur.fetchone()
+    if row is None or row[0] == 'YES':
+        return False
+
+    cur.execute("SELECT pg_get_serial_sequence(%s, %s);", (table, column))
+    serial_sequence = cur.fetchone()[0]
+    identifiers = {'table': sql.Identifier(table), 'column': sql.Identifier(column)}
+    cur.execute(sql.SQL("ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT;").format(**identifiers))
+    if serial_sequence:
+        cur.execute(sql.SQL("DROP SEQUENCE {sequence};").format(sequence=sql.SQL(serial_sequence)))
+    cur.execute(sql.SQL("""
+        ALTER TABLE {table} ALTER COLUMN {column} TYPE BIGINT;
+        ALTER TABLE {table} ALTER COLUMN {column} ADD GENERATED BY DEFAULT AS IDENTITY;
+    """).format(**identifiers))
+    cur.execute(
+        sql.SQL("SELECT setval(pg_get_serial_sequence(%s, %s), COALESCE(MAX({column}), 0) + 1, false) FROM {table};")
+        .format(**identifiers),
+        (table, column)
+    )
+    return True
+
+# Full schema, sent to the server in a single round trip by create_tables().
+# Every statement is idempotent, so re-running it against an existing database is safe.
+SCHEMA_DDL = """
+    -- 1. Meters
+    CREATE TABLE IF NOT EXISTS meters (
+        meter_id VARCHAR(50) PRIMARY KEY,
+        meter_no VARCHAR(50) UNIQUE NOT NULL,
+        location VARCHAR(100),
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- 2. Bring 'meters' tables from older schema versions up to date
+    ALTER TABLE meters ADD COLUMN IF NOT EXISTS created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+    ALTER TABLE meters ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+
+    -- 3. Readings
+    CREATE TABLE IF NOT EXISTS readings (
+        reading_id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        meter_id VARCHAR(50) NOT NULL REFERENCES meters(meter_id) ON DELETE CASCADE,
+        timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+        voltage_vrn DECIMAL(10, 3),
+        voltage_vyn DECIMAL(10, 3),
+        voltage_vbn DECIMAL(10, 3),
+        current_ir DECIMAL(10, 3),
+        current_iy DECIMAL(10, 3),
+        current_ib DECIMAL(10, 3),
+        energy_kwh_import DECIMAL(15, 3),
+        energy_kvah_import DECIMAL(15, 3),
+        energy_kwh_export DECIMAL(15, 3),
+        energy_kvah_export DECIMAL(15, 3),
+        network_info VARCHAR(255),
+        ingestion_time TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (meter_id, timestamp) -- Ensure unique readings per meter at a given timestamp
+    ) WITH (fillfactor = 90, autovacuum_vacuum_scale_factor = 0.05);
+
+    -- 4. Forecast runs
+    CREATE TABLE IF NOT EXISTS forecast_runs (
+        run_id VARCHAR(255) PRIMARY KEY, -- new_run_id() (UUIDv7 hex) string; kept textual so API clients get back the exact id they were given
+        meter_id VARCHAR(50) NOT NULL REFERENCES meters(meter_id) ON DELETE CASCADE,
+        model_name VARCHAR(100) NOT NULL,
+        prediction_start_time TIMESTAMP WITH TIME ZONE NOT NULL,
+        prediction_end_time TIMESTAMP WITH TIME ZONE NOT NULL,
+        training_data_start TIMESTAMP WITH TIME ZONE,
+        training_data_end TIMESTAMP WITH TIME ZONE,
+        mae DECIMAL(10, 4), -- Mean Absolute Error
+        rmse DECIMAL(10, 4), -- Root Mean Squared Error
+        run_timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- 5. Forecast predictions
+    CREATE TABLE IF NOT EXISTS forecast_predictions (
+        prediction_id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        run_id VARCHAR(255) NOT NULL REFERENCES forecast_runs(run_id) ON DELETE CASCADE,
+        timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+        predicted_kwh DECIMAL(15, 3) NOT NULL,
+        actual_kwh DECIMAL(15, 3), -- Can be NULL if actuals aren't known for that time
+        UNIQUE (run_id, timestamp) -- Ensure unique predictions per run at a given timestamp
+    ) WITH (fillfactor = 90, autovacuum_vacuum_scale_factor = 0.05);
+
+    -- 6. Apply the storage settings to tables created by older schema versions
+    -- (only affects pages written from now on; no rewrite)
+    ALTER TABLE readings SET (fillfactor = 90, autovacuum_vacuum_scale_factor = 0.05);
+    ALTER TABLE forecast_predictions SET (fillfactor = 90, autovacuum_vacuum_scale_factor = 0.05);
+
+    -- 7. Index 'readings' for time-bounded queries.
+    -- The UNIQUE (meter_id, timestamp) constraint already provides the composite B-tree used by
+    -- per-meter range scans and ORDER BY timestamp DESC LIMIT n (scanned backwards), so only a
+    -- compact BRIN index is added for time-only scans of the append-only table.
+    -- This is the SCHEMA_SENTINEL and must stay the last object created.
+    CREATE INDEX IF NOT EXISTS readings_ts_brin ON readings
+    USING BRIN (timestamp) WITH (pages_per_range = 64);
+"""
 
 def create_tables():
     """Creates meters, readings, forecast_runs, and forecast_predictions tables if they don't exist."""
@@ -143,91 +697,53 @@ def create_tables():
         conn = get_db_conn()
         cur = conn.cursor()
 
-        # 1. Create the 'meters' table if not exists
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS meters (
-                meter_id VARCHAR(50) PRIMARY KEY,
-                meter_no VARCHAR(50) UNIQUE NOT NULL,
-                location VARCHAR(100),
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        # 0. Skip the DDL (and its table locks) entirely when the schema is already in place
+        cur.execute(
+            """
+            SELECT to_regclass(%s) IS NOT NULL AND EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_schema = 'public' AND table_name = 'readings'
+                  AND column_name = 'reading_id' AND is_identity = 'YES'
             );
-        """)
-        logger.info("Table 'meters' ensured to exist.")
-
-        # 2. Update existing 'meters' table with new columns if they are missing
-        # This handles cases where the table exists from an older schema version.
+            """,
+            (SCHEMA_SENTINEL,)
+        )
+        if cur.fetchone()[0]:
+            logger.info("Schema sentinel '%s' found. Database tables already exist, skipping creation.", SCHEMA_SENTINEL)
+            return
+
+        # 1-7. Create/update all tables and indexes in one round trip and one transaction
+        cur.execute(SCHEMA_DDL)
+        conn.commit() # Persist the schema before the optional migrations below
+        logger.info("Tables 'meters', 'readings', 'forecast_runs' and 'forecast_predictions' ensured to exist.")
+
+        # 8. Move SERIAL keys from older schema versions to BIGINT identity columns
+        for table, column in (('readings', 'reading_id'), ('forecast_predictions', 'prediction_id')):
+            try:
+                if _migrate_serial_to_identity(cur, table, column):
+                    conn.commit()
+                    logger.info("Column '%s.%s' migrated from SERIAL to BIGINT identity.", table, column)
+            except Exception as e:
+                logger.warning("Could not migrate '%s.%s' to a BIGINT identity column: %s", table, column, e, exc_info=True)
+                conn.rollback() # Keep the SERIAL column
+
+        # 9. Partition 'readings' by month with TimescaleDB, when the extension is available
         try:
-            cur.execute("""
-                ALTER TABLE meters ADD COLUMN IF NOT EXISTS created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
-                ALTER TABLE meters ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
-            """)
-            conn.commit() # Commit these alter operations immediately to ensure schema update
-            logger.info("Ensured 'created_at' and 'updated_at' columns exist in 'meters' table.")
+            if _ensure_readings_hypertable(cur):
+                conn.commit()
+                logger.info("Table 'readings' ensured to be a TimescaleDB hypertable.")
+            else:
+                logger.info("TimescaleDB extension not installed. Keeping 'readings' as a regular table.")
         except Exception as e:
-            logger.warning(f"Could not alter 'meters' table (might already be up-to-date or other issue): {e}", exc_info=True)
-            conn.rollback() # Rollback if alter failed, but continue with other tables
-
-        # 3. Create the 'readings' table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS readings (
-                reading_id SERIAL PRIMARY KEY,
-                meter_id VARCHAR(50) NOT NULL REFERENCES meters(meter_id) ON DELETE CASCADE,
-                timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
-                voltage_vrn DECIMAL(10, 3),
-                voltage_vyn DECIMAL(10, 3),
-                voltage_vbn DECIMAL(10, 3),
-                current_ir DECIMAL(10, 3),
-                current_iy DECIMAL(10, 3),
-                current_ib DECIMAL(10, 3),
-                energy_kwh_import DECIMAL(15, 3),
-                energy_kvah_import DECIMAL(15, 3),
-                energy_kwh_export DECIMAL(15, 3),
-                energy_kvah_export DECIMAL(15, 3),
-                network_info VARCHAR(255),
-                ingestion_time TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE (meter_id, timestamp) -- Ensure unique readings per meter at a given timestamp
-            );
-        """)
-        logger.info("Table 'readings' ensured to exist.")
-
-        # 4. Create the 'forecast_runs' table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS forecast_runs (
-                run_id VARCHAR(255) PRIMARY KEY, -- Using VARCHAR to store UUID as string
-                meter_id VARCHAR(50) NOT NULL REFERENCES meters(meter_id) ON DELETE CASCADE,
-                model_name VARCHAR(100) NOT NULL,
-                prediction_start_time TIMESTAMP WITH TIME ZONE NOT NULL,
-                prediction_end_time TIMESTAMP WITH TIME ZONE NOT NULL,
-                training_data_start TIMESTAMP WITH TIME ZONE,
-                training_data_end TIMESTAMP WITH TIME ZONE,
-                mae DECIMAL(10, 4), -- Mean Absolute Error
-                rmse DECIMAL(10, 4), -- Root Mean Squared Error
-                run_timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
-        logger.info("Table 'forecast_runs' ensured to exist.")
-
-        # 5. Create the 'forecast_predictions' table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS forecast_predictions (
-                prediction_id SERIAL PRIMARY KEY,
-                run_id VARCHAR(255) NOT NULL REFERENCES forecast_runs(run_id) ON DELETE CASCADE,
-                timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
-                predicted_kwh DECIMAL(15, 3) NOT NULL,
-                actual_kwh DECIMAL(15, 3), -- Can be NULL if actuals aren't known for that time
-                UNIQUE (run_id, timestamp) -- Ensure unique predictions per run at a given timestamp
-            );
-        """)
-        logger.info("Table 'forecast_predictions' ensured to exist.")
+            logger.warning("Could not convert 'readings' to a hypertable: %s", e, exc_info=True)
+            conn.rollback() # Keep the regular table
 
-        conn.commit() # Commit all table creation/alter operations
         logger.info("All database tables created/updated successfully.")
 
     except Exception as e:
         if conn:
             conn.rollback() # Rollback changes if any error occurs
-        logger.critical(f"Error during table creation/update: {e}", exc_info=True)
+        logger.critical("Error during table creation/update: %s", e, exc_info=True)
         raise # Re-raise to indicate failure
     finally:
         if conn:
@@ -245,7 +761,8 @@ def insert_meter_details(meter_id: str, meter_no: str, location: str):
     try:
         conn = get_db_conn()
         with conn.cursor() as cur:
-            # The SQL statement correctly references only columns that exist.
+            # created_at comes from the column default on INSERT and is left untouched
+            # by the ON CONFLICT branch, so no lookup of the existing row is needed.
             cur.execute(
                 """
                 INSERT INTO meters (meter_id, meter_no, location, updated_at)
@@ -258,10 +775,11 @@ def insert_meter_details(meter_id: str, meter_no: str, location: str):
                 (meter_id, meter_no, location)
             )
             conn.commit()
-            logger.info(f"Meter details for '{meter_id}' were successfully inserted or updated.")
+            _meter_details_cache.clear()
+            logger.info("Meter details for '%s' were successfully inserted or updated.", meter_id)
     except Exception as e:
         if conn: conn.rollback()
-        logger.error(f"Error inserting/updating meter details for {meter_id}: {e}", exc_info=True)
+        logger.error("Error inserting/updating meter details for %s: %s", meter_id, e, exc_info=True)
         raise
     finally:
         if conn: return_db_conn(conn)
@@ -279,64 +797,47 @@ def insert_meter_readings(readings_data: List[Dict[str, Any]]):
     try:
         conn = get_db_conn()
         with conn.cursor() as cur:
-            insert_query = sql.SQL("""
-                INSERT INTO readings (
-                    meter_id, timestamp, voltage_vrn, voltage_vyn, voltage_vbn,
-                    current_ir, current_iy, current_ib, energy_kwh_import,
-                    energy_kvah_import, energy_kwh_export, energy_kvah_export, network_info
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                )
-                ON CONFLICT (meter_id, timestamp) DO NOTHING;
-            """)
-
-            records_to_insert = []
-            for reading in readings_data:
-                # Ensure timestamp is timezone-aware and converted to UTC for storage
-                # If timestamp is naive (no tzinfo), assume it's in APP_TIMEZONE then convert to UTC
-                timestamp_obj = reading['timestamp']
-                if isinstance(timestamp_obj, datetime):
-                    if timestamp_obj.tzinfo is None:
-                        timestamp_utc = APP_TIMEZONE.localize(timestamp_obj).astimezone(timezone.utc)
-                    else:
-                        timestamp_utc = timestamp_obj.astimezone(timezone.utc)
-                else:
-                    timestamp_utc = timestamp_obj # If not datetime, pass as is (e.g., already string)
-
-                records_to_insert.append(
-                    (
-                        reading.get('meter_id'),
-                        timestamp_utc,
-                        reading.get('voltage_vrn'),
-                        reading.get('voltage_vyn'),
-                        reading.get('voltage_vbn'),
-                        reading.get('current_ir'),
-                        reading.get('current_iy'),
-                        reading.get('current_ib'),
-                        reading.get('energy_kwh_import'),
-                        reading.get('energy_kvah_import'),
-                        reading.get('energy_kwh_export'),
-                        reading.get('energy_kvah_export'),
-                        reading.get('network_info')
-                    )
-                )
+            # Rows are generated lazily and consumed page by page, so the full list of tuples
+            # is never materialized. Naive timestamps are assumed to be in APP_TIMEZONE.
+            records_to_insert = (
+                (reading.get('meter_id'), _localize_if_naive(reading['timestamp']))
+                + _get_reading_values(_READING_VALUE_DEFAULTS | reading)
+                for reading in readings_data
+            )
 
-            if records_to_insert:
-                cur.executemany(insert_query, records_to_insert)
-                conn.commit()
-                logger.info(f"Successfully processed {len(records_to_insert)} readings for database insertion. Inserted/skipped based on conflict.")
+            if len(readings_data) > COPY_THRESHOLD_ROWS:
+                _copy_via_staging(cur, 'readings', READING_INSERT_COLUMNS, records_to_insert,
+                                  "ON CONFLICT (meter_id, timestamp) DO NOTHING")
             else:
-                logger.info("No valid readings to insert after processing.")
+                # One multi-row INSERT per page, several pages per round trip
+                _execute_values_pipelined(cur, INSERT_READINGS_SQL, records_to_insert,
+                                          template=INSERT_READINGS_TEMPLATE)
+            conn.commit()
+            logger.debug("Successfully processed %d readings for database insertion. Inserted/skipped based on conflict.", len(readings_data))
 
     except Exception as e:
         if conn:
             conn.rollback()
-        logger.exception(f"Error during database insertion of readings: {e}")
+        logger.exception("Error during database insertion of readings: %s", e)
         raise # Re-raise to signal failure
     finally:
         if conn:
             return_db_conn(conn)
 
+def new_run_id() -> str:
+    """
+    Returns a new forecast run_id: a UUIDv7 as 32 hex characters. Its leading 48 bits are the
+    Unix time in milliseconds, so consecutive runs land next to each other in the run_id
+    primary key index instead of at random positions as uuid4 ids do. Uses uuid.uuid7() where
+    available (Python 3.14+).
+    """
+    if hasattr(uuid, 'uuid7'):
+        return uuid.uuid7().hex
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = (value & ~(0xF << 76)) | (0x7 << 76) # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62) # RFC 4122 variant
+    return f"{value:032x}"
+
 def insert_forecast_run(run_id: str, meter_id: str, model_name: str,
                         prediction_start_time: datetime, prediction_end_time: datetime,
                         training_data_start: Optional[datetime] = None, training_data_end: Optional[datetime] = None,
@@ -346,13 +847,7 @@ def insert_forecast_run(run_id: str, meter_id: str, model_name: str,
     try:
         conn = get_db_conn()
         with conn.cursor() as cur:
-            # Ensure timestamps are UTC for database storage consistency
-            prediction_start_time_utc = prediction_start_time.astimezone(timezone.utc)
-            prediction_end_time_utc = prediction_end_time.astimezone(timezone.utc)
-            training_data_start_utc = training_data_start.astimezone(timezone.utc) if training_data_start and training_data_start.tzinfo else APP_TIMEZONE.localize(training_data_start).astimezone(timezone.utc) if training_data_start else None
-            training_data_end_utc = training_data_end.astimezone(timezone.utc) if training_data_end and training_data_end.tzinfo else APP_TIMEZONE.localize(training_data_end).astimezone(timezone.utc) if training_data_end else None
-
-
+            # Naive timestamps are assumed to be in APP_TIMEZONE; Postgres stores all of them as UTC
             cur.execute(
                 """
                 INSERT INTO forecast_runs (
@@ -363,22 +858,23 @@ def insert_forecast_run(run_id: str, meter_id: str, model_name: str,
                 RETURNING run_id;
                 """,
                 (run_id, meter_id, model_name,
-                 prediction_start_time_utc, prediction_end_time_utc,
-                 training_data_start_utc, training_data_end_utc, mae, rmse)
+                 _localize_if_naive(prediction_start_time), _localize_if_naive(prediction_end_time),
+                 _localize_if_naive(training_data_start), _localize_if_naive(training_data_end), mae, rmse)
             )
             result = cur.fetchone()
             inserted_run_id = result[0] if result else None
             conn.commit()
+            _latest_forecast_run_cache.clear()
             if inserted_run_id:
-                logger.info(f"Forecast run '{inserted_run_id}' for meter '{meter_id}' inserted.")
+                logger.info("Forecast run '%s' for meter '%s' inserted.", inserted_run_id, meter_id)
             else:
-                logger.debug(f"Forecast run '{run_id}' for meter '{meter_id}' already exists or was not inserted.")
+                logger.debug("Forecast run '%s' for meter '%s' already exists or was not inserted.", run_id, meter_id)
             return run_id # Always return the passed run_id
 
     except Exception as e:
         if conn:
             conn.rollback()
-        logger.error(f"Error inserting forecast run {run_id}: {e}", exc_info=True)
+        logger.error("Error inserting forecast run %s: %s", run_id, e, exc_info=True)
         raise # Re-raise to signal failure
     finally:
         if conn:
@@ -399,16 +895,90 @@ def update_forecast_run_metrics(run_id: str, mae: Optional[float], rmse: Optiona
                 (mae, rmse, run_id)
             )
             conn.commit()
+            _latest_forecast_run_cache.clear() # run_timestamp changed, so the latest run may have too
             if cur.rowcount > 0:
-                logger.info(f"Updated metrics for forecast run ID: {run_id} (MAE: {mae}, RMSE: {rmse}).")
+                logger.info("Updated metrics for forecast run ID: %s (MAE: %s, RMSE: %s).", run_id, mae, rmse)
                 return True
             else:
-                logger.warning(f"No forecast run found with ID: {run_id} to update metrics for.")
+                logger.warning("No forecast run found with ID: %s to update metrics for.", run_id)
                 return False
     except Exception as e:
         if conn:
             conn.rollback()
-        logger.error(f"Error updating metrics for forecast run {run_id}: {e}", exc_info=True)
+        logger.error("Error updating metrics for forecast run %s: %s", run_id, e, exc_info=True)
+        raise # Re-raise to signal failure
+    finally:
+        if conn:
+            return_db_conn(conn)
+
+
+def refresh_forecast_run_metrics(run_id: str) -> Optional[Dict[str, Optional[float]]]:
+    """
+    Recomputes a stored run's MAE and RMSE on the server from the readings that now exist for
+    its predictions (e.g., once a forecast window has passed). In one statement, the run's
+    predictions get their actual_kwh from the first reading in their 15-minute slot (as in
+    insert_forecast_run_joining_actuals), and the metrics are aggregated from the same rows into
+    the run. When no prediction has an actual reading, the stored metrics are left as they are.
+    Returns the run's {'mae': ..., 'rmse': ...} afterwards, or None if the run does not exist.
+    """
+    conn = None
+    try:
+        conn = get_db_conn()
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                WITH matched AS (
+                    SELECT p.timestamp, r.energy_kwh_import AS actual_kwh
+                    FROM forecast_predictions p
+                    JOIN forecast_runs fr ON fr.run_id = p.run_id
+                    CROSS JOIN LATERAL (
+                        SELECT to_timestamp(floor(extract(epoch FROM p.timestamp) / %(slot_seconds)s) * %(slot_seconds)s) AS slot_start
+                    ) s
+                    JOIN LATERAL (
+                        SELECT energy_kwh_import FROM readings
+                        WHERE meter_id = fr.meter_id AND timestamp >= s.slot_start
+                          AND timestamp < s.slot_start + make_interval(secs => %(slot_seconds)s)
+                        ORDER BY timestamp ASC
+                        LIMIT 1
+                    ) r ON TRUE
+                    WHERE p.run_id = %(run_id)s
+                ),
+                filled AS (
+                    UPDATE forecast_predictions p
+                    SET actual_kwh = matched.actual_kwh
+                    FROM matched
+                    WHERE p.run_id = %(run_id)s AND p.timestamp = matched.timestamp
+                    RETURNING p.predicted_kwh, p.actual_kwh
+                )
+                UPDATE forecast_runs
+                -- Without any actual the aggregates are NULL; keep the metrics already stored
+                SET mae = COALESCE(m.mae, forecast_runs.mae), rmse = COALESCE(m.rmse, forecast_runs.rmse)
+                FROM (
+                    SELECT avg(abs(actual_kwh - predicted_kwh)) AS mae,
+                           sqrt(avg((actual_kwh - predicted_kwh) ^ 2)) AS rmse
+                    FROM filled
+                ) m
+                WHERE forecast_runs.run_id = %(run_id)s
+                RETURNING forecast_runs.mae, forecast_runs.rmse;
+                """,
+                {'run_id': run_id, 'slot_seconds': ACTUALS_SLOT_SECONDS}
+            )
+            row = cur.fetchone()
+            conn.commit()
+            if row is None:
+                logger.warning("No forecast run found with ID: %s to refresh metrics for.", run_id)
+                return None
+            _latest_forecast_run_cache.clear()
+            metrics = {
+                'mae': float(row[0]) if row[0] is not None else None,
+                'rmse': float(row[1]) if row[1] is not None else None,
+            }
+            logger.info("Refreshed metrics for forecast run ID: %s (MAE: %s, RMSE: %s).", run_id, metrics['mae'], metrics['rmse'])
+            return metrics
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        logger.error("Error refreshing metrics for forecast run %s: %s", run_id, e, exc_info=True)
         raise # Re-raise to signal failure
     finally:
         if conn:
@@ -419,206 +989,478 @@ def insert_forecast_predictions(run_id: str, predictions_data: List[Dict[str, An
     """Inserts a list of forecast predictions for a given run ID."""
     conn = None
     if not predictions_data:
-        logger.info(f"No forecast predictions data provided for run {run_id}. Skipping insertion.")
+        logger.info("No forecast predictions data provided for run %s. Skipping insertion.", run_id)
         return
 
     try:
         conn = get_db_conn()
         with conn.cursor() as cur:
-            insert_query = sql.SQL("""
-                INSERT INTO forecast_predictions (run_id, timestamp, predicted_kwh, actual_kwh)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (run_id, timestamp) DO UPDATE SET -- Update existing predictions if conflict
-                    predicted_kwh = EXCLUDED.predicted_kwh,
-                    actual_kwh = EXCLUDED.actual_kwh;
-            """)
-            records_to_insert = []
-            for p in predictions_data:
-                # Ensure timestamp is timezone-aware and converted to UTC for storage
-                timestamp_obj = p['timestamp']
-                if isinstance(timestamp_obj, datetime):
-                    if timestamp_obj.tzinfo is None:
-                        timestamp_utc = APP_TIMEZONE.localize(timestamp_obj).astimezone(timezone.utc)
-                    else:
-                        timestamp_utc = timestamp_obj.astimezone(timezone.utc)
-                else:
-                    timestamp_utc = timestamp_obj # If not datetime, pass as is (e.g., already string)
-
-                records_to_insert.append(
-                    (run_id, timestamp_utc, p['predicted_kwh'], p.get('actual_kwh'))
-                )
+            records_to_insert = (
+                (run_id, _localize_if_naive(p['timestamp']), p['predicted_kwh'], p.get('actual_kwh'))
+                for p in predictions_data
+            )
 
-            cur.executemany(insert_query, records_to_insert)
+            if len(predictions_data) > COPY_THRESHOLD_ROWS:
+                _copy_via_staging(cur, 'forecast_predictions', PREDICTION_INSERT_COLUMNS, records_to_insert,
+                                  "ON CONFLICT (run_id, timestamp) DO UPDATE SET "
+                                  "predicted_kwh = EXCLUDED.predicted_kwh, actual_kwh = EXCLUDED.actual_kwh")
+            else:
+                # One multi-row INSERT per BULK_INSERT_PAGE_SIZE predictions
+                execute_values(cur, INSERT_PREDICTIONS_SQL, records_to_insert,
+                               template="(%s, %s, %s, %s)", page_size=BULK_INSERT_PAGE_SIZE)
             conn.commit()
-            logger.info(f"Successfully inserted/updated {len(records_to_insert)} forecast predictions for run '{run_id}'.")
+            logger.info("Successfully inserted/updated %d forecast predictions for run '%s'.", len(predictions_data), run_id)
     except Exception as e:
         if conn:
             conn.rollback()
-        logger.error(f"Error inserting forecast predictions for run {run_id}: {e}", exc_info=True)
+        logger.error("Error inserting forecast predictions for run %s: %s", run_id, e, exc_info=True)
         raise # Re-raise to signal failure
     finally:
         if conn:
             return_db_conn(conn)
 
-# --- Data Retrieval Functions (for DataAnalyzer and DigitalTwin) ---
+# Inserts one run (data-modifying CTE) and its predictions (unnested from parallel arrays).
+# The run row is visible to the foreign key check at the end of the statement.
+_INSERT_RUN_WITH_PREDICTIONS_SQL = """
+    WITH new_run AS (
+        INSERT INTO forecast_runs (
+            run_id, meter_id, model_name, prediction_start_time, prediction_end_time,
+            training_data_start, training_data_end, mae, rmse
+        ) VALUES (%(run_id)s, %(meter_id)s, %(model_name)s, %(start)s, %(end)s,
+                  %(training_start)s, %(training_end)s, %(mae)s, %(rmse)s)
+        ON CONFLICT (run_id) DO NOTHING
+        RETURNING run_id
+    )
+    INSERT INTO forecast_predictions (run_id, timestamp, predicted_kwh, actual_kwh)
+    SELECT %(run_id)s, p.timestamp, p.predicted_kwh, p.actual_kwh
+    FROM unnest(%(timestamps)s::timestamptz[], %(predicted)s::numeric[], %(actuals)s::numeric[])
+        AS p(timestamp, predicted_kwh, actual_kwh)
+    ON CONFLICT (run_id, timestamp) DO UPDATE SET
+        predicted_kwh = EXCLUDED.predicted_kwh,
+        actual_kwh = EXCLUDED.actual_kwh;
+"""
+
+def _forecast_run_params(run_id: str, meter_id: str, model_name: str,
+                         prediction_start_time: datetime, prediction_end_time: datetime,
+                         predictions_data: Iterable[Dict[str, Any]],
+                         training_data_start: Optional[datetime] = None, training_data_end: Optional[datetime] = None,
+                         mae: Optional[float] = None, rmse: Optional[float] = None) -> Dict[str, Any]:
+    """Builds the _INSERT_RUN_WITH_PREDICTIONS_SQL parameters, consuming predictions_data in one pass."""
+    timestamps, predicted, actuals = [], [], []
+    for p in predictions_data:
+        timestamps.append(_localize_if_naive(p['timestamp']))
+        predicted.append(p['predicted_kwh'])
+        actuals.append(p.get('actual_kwh'))
+    return {
+        'run_id': run_id, 'meter_id': meter_id, 'model_name': model_name,
+        'start': _localize_if_naive(prediction_start_time), 'end': _localize_if_naive(prediction_end_time),
+        'training_start': _localize_if_naive(training_data_start),
+        'training_end': _localize_if_naive(training_data_end),
+        'mae': mae, 'rmse': rmse,
+        'timestamps': timestamps, 'predicted': predicted, 'actuals': actuals
+    }
 
-def get_latest_meter_readings_by_limit(meter_id: str, limit_count: int = 20) -> List[Dict[str, Any]]:
+def insert_forecast_run_with_predictions(run_id: str, meter_id: str, model_name: str,
+                                         prediction_start_time: datetime, prediction_end_time: datetime,
+                                         predictions_data: Iterable[Dict[str, Any]],
+                                         training_data_start: Optional[datetime] = None, training_data_end: Optional[datetime] = None,
+                                         mae: Optional[float] = None, rmse: Optional[float] = None) -> str:
     """
-    Retrieves the latest 'limit_count' energy readings for a given meter ID,
-    ordered by timestamp descending (most recent first).
-    Returns a list of dictionaries with all relevant reading columns.
-    Timestamps are converted to APP_TIMEZONE.
+    Inserts a forecast run together with its predictions in a single statement (one round trip,
+    one transaction): the run is inserted by a data-modifying CTE and the predictions are
+    unnested from three parallel arrays. Equivalent to insert_forecast_run followed by
+    insert_forecast_predictions (and update_forecast_run_metrics, when mae/rmse are given).
+    predictions_data may be any iterable (e.g., a generator); it is consumed in a single pass.
+    Returns the run_id.
+    """
+    insert_forecast_runs_with_predictions([dict(
+        run_id=run_id, meter_id=meter_id, model_name=model_name,
+        prediction_start_time=prediction_start_time, prediction_end_time=prediction_end_time,
+        predictions_data=predictions_data,
+        training_data_start=training_data_start, training_data_end=training_data_end,
+        mae=mae, rmse=rmse
+    )])
+    return run_id
+
+def insert_forecast_runs_with_predictions(runs: List[Dict[str, Any]]) -> List[str]:
+    """
+    Inserts several forecast runs with their predictions on one connection and in one
+    transaction, so either every run is recorded or none is. Each item holds the keyword
+    arguments of insert_forecast_run_with_predictions. Returns the run_ids in order.
     """
+    if not runs:
+        return []
     conn = None
+    run_ids = [run['run_id'] for run in runs]
     try:
         conn = get_db_conn()
-        with conn.cursor(cursor_factory=DictCursor) as cur:
+        stored = []
+        with conn.cursor() as cur:
+            for run in runs:
+                params = _forecast_run_params(**run)
+                cur.execute(_INSERT_RUN_WITH_PREDICTIONS_SQL, params)
+                stored.append((params['run_id'], params['meter_id'], len(params['timestamps'])))
+            conn.commit()
+            _latest_forecast_run_cache.clear()
+            for run_id, meter_id, prediction_count in stored:
+                logger.info("Forecast run '%s' for meter '%s' stored with %d predictions.", run_id, meter_id, prediction_count)
+            return run_ids
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        logger.error("Error inserting forecast runs %s with predictions: %s", ', '.join(run_ids), e, exc_info=True)
+        raise # Re-raise to signal failure
+    finally:
+        if conn:
+            return_db_conn(conn)
+
+def insert_forecast_run_joining_actuals(run_id: str, meter_id: str, model_name: str,
+                                        prediction_start_time: datetime, prediction_end_time: datetime,
+                                        predictions_data: Iterable[Dict[str, Any]],
+                                        training_data_start: Optional[datetime] = None,
+                                        training_data_end: Optional[datetime] = None) -> Dict[str, Optional[float]]:
+    """
+    Like insert_forecast_run_with_predictions, but the actual readings are looked up by the
+    server: each prediction is joined to the meter's first reading in the same 15-minute slot
+    (the rule DigitalTwin applies to client-side actuals, so off-slot readings match too), the
+    joined actual_kwh is stored with it, and MAE/RMSE are aggregated from the same join into the
+    run row. One statement, and the actuals never travel to the client.
+    Returns {'mae': ..., 'rmse': ...}, with None values when no prediction has an actual reading.
+    predictions_data may be any iterable; it is consumed in a single pass.
+    """
+    timestamps, predicted = [], []
+    for p in predictions_data:
+        timestamps.append(_localize_if_naive(p['timestamp']))
+        predicted.append(p['predicted_kwh'])
+
+    conn = None
+    try:
+        conn = get_db_conn()
+        with conn.cursor() as cur:
             cur.execute(
                 """
-                SELECT
-                    reading_id, meter_id, timestamp,
-                    voltage_vrn, voltage_vyn, voltage_vbn,
-                    current_ir, current_iy, current_ib,
-                    energy_kwh_import, energy_kvah_import, energy_kwh_export, energy_kvah_export,
-                    network_info, ingestion_time
-                FROM readings
-                WHERE meter_id = %s
-                ORDER BY timestamp DESC
-                LIMIT %s;
+                WITH joined AS (
+                    SELECT p.timestamp, p.predicted_kwh, r.energy_kwh_import AS actual_kwh
+                    FROM unnest(%(timestamps)s::timestamptz[], %(predicted)s::numeric[]) AS p(timestamp, predicted_kwh)
+                    CROSS JOIN LATERAL (
+                        SELECT to_timestamp(floor(extract(epoch FROM p.timestamp) / %(slot_seconds)s) * %(slot_seconds)s) AS slot_start
+                    ) s
+                    LEFT JOIN LATERAL (
+                        SELECT energy_kwh_import FROM readings
+                        WHERE meter_id = %(meter_id)s AND timestamp >= s.slot_start
+                          AND timestamp < s.slot_start + make_interval(secs => %(slot_seconds)s)
+                        ORDER BY timestamp ASC
+                        LIMIT 1
+                    ) r ON TRUE
+                ),
+                new_run AS (
+                    INSERT INTO forecast_runs (
+                        run_id, meter_id, model_name, prediction_start_time, prediction_end_time,
+                        training_data_start, training_data_end, mae, rmse
+                    )
+                    SELECT %(run_id)s, %(meter_id)s, %(model_name)s, %(start)s, %(end)s,
+                           %(training_start)s, %(training_end)s,
+                           avg(abs(actual_kwh - predicted_kwh)),
+                           sqrt(avg((actual_kwh - predicted_kwh) ^ 2))
+                    FROM joined
+                    ON CONFLICT (run_id) DO NOTHING
+                    RETURNING mae, rmse
+                ),
+                new_predictions AS (
+                    INSERT INTO forecast_predictions (run_id, timestamp, predicted_kwh, actual_kwh)
+                    SELECT %(run_id)s, timestamp, predicted_kwh, actual_kwh FROM joined
+                    ON CONFLICT (run_id, timestamp) DO UPDATE SET
+                        predicted_kwh = EXCLUDED.predicted_kwh,
+                        actual_kwh = EXCLUDED.actual_kwh
+                )
+                SELECT mae, rmse FROM new_run;
                 """,
-                (meter_id, limit_count)
+                {
+                    'run_id': run_id, 'meter_id': meter_id, 'model_name': model_name,
+                    'start': _localize_if_naive(prediction_start_time), 'end': _localize_if_naive(prediction_end_time),
+                    'training_start': _localize_if_naive(training_data_start),
+                    'training_end': _localize_if_naive(training_data_end),
+                    'timestamps': timestamps, 'predicted': predicted,
+                    'slot_seconds': ACTUALS_SLOT_SECONDS
+                }
             )
-            readings = cur.fetchall()
-            
-            # Process results: convert DictRow to dict, handle timezone and Decimal
-            processed_readings = []
-            for row in readings:
-                row_dict = dict(row) # Convert DictRow to standard dict
-
-                # Convert timestamp to APP_TIMEZONE
-                if 'timestamp' in row_dict and isinstance(row_dict['timestamp'], datetime):
-                    row_dict['timestamp'] = row_dict['timestamp'].astimezone(APP_TIMEZONE)
-                if 'ingestion_time' in row_dict and isinstance(row_dict['ingestion_time'], datetime):
-                    row_dict['ingestion_time'] = row_dict['ingestion_time'].astimezone(APP_TIMEZONE)
-
-                # Convert Decimal fields to float for JSON serialization
-                for key, value in row_dict.items():
-                    if isinstance(value, Decimal):
-                        row_dict[key] = float(value)
-                
-                processed_readings.append(row_dict)
-
-            logger.debug(f"Retrieved {len(processed_readings)} latest readings for meter {meter_id}.")
-            return processed_readings
+            row = cur.fetchone()
+            conn.commit()
+            _latest_forecast_run_cache.clear()
+            metrics = {
+                'mae': float(row[0]) if row and row[0] is not None else None,
+                'rmse': float(row[1]) if row and row[1] is not None else None,
+            }
+            logger.info("Forecast run '%s' for meter '%s' stored with %d predictions (MAE: %s, RMSE: %s).",
+                        run_id, meter_id, len(timestamps), metrics['mae'], metrics['rmse'])
+            return metrics
     except Exception as e:
-        logger.error(f"Error fetching latest readings for meter {meter_id}: {e}", exc_info=True)
-        return []
+        if conn:
+            conn.rollback()
+        logger.error("Error inserting forecast run %s with server-side actuals: %s", run_id, e, exc_info=True)
+        raise # Re-raise to signal failure
     finally:
         if conn:
             return_db_conn(conn)
 
-def get_meter_readings_in_range(meter_id: str, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
+# --- Data Retrieval Functions (for DataAnalyzer and DigitalTwin) ---
+
+def get_latest_meter_readings_by_limit(meter_id: str, limit_count: int = 20) -> List[Dict[str, Any]]:
     """
-    Retrieves meter readings for a given meter ID within a specified time range.
-    Returns a list of dictionaries with essential reading columns for forecasting.
+    Retrieves the latest 'limit_count' energy readings for a given meter ID,
+    ordered by timestamp descending (most recent first).
+    Returns a list of dictionaries with all relevant reading columns.
     Timestamps are converted to APP_TIMEZONE.
     """
-    conn = None
     try:
-        conn = get_db_conn()
-        with conn.cursor(cursor_factory=DictCursor) as cur:
-            # Convert input times to UTC for database query consistency
-            start_time_utc = start_time.astimezone(timezone.utc)
-            end_time_utc = end_time.astimezone(timezone.utc)
+        with db_cursor(readonly=True) as (conn, cur):
+            _execute_prepared(cur, 'latest_readings_by_limit', (meter_id, limit_count))
+            # Process results: tuples to dicts, Decimal to float for JSON
+            processed_readings = list(_iter_converted_rows(cur))
 
+            logger.debug("Retrieved %d latest readings for meter %s.", len(processed_readings), meter_id)
+            return processed_readings
+    except Exception as e:
+        logger.error("Error fetching latest readings for meter %s: %s", meter_id, e, exc_info=True)
+        return []
+
+def get_latest_meter_readings_for_meters(meter_ids: List[str], limit_count: int = 20) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Batched form of get_latest_meter_readings_by_limit: retrieves the latest 'limit_count'
+    readings for every meter in 'meter_ids' with a single LATERAL query instead of one query per meter.
+    Returns a dict mapping each requested meter ID to its readings, most recent first
+    (an empty list for meters without readings). Timestamps are converted to APP_TIMEZONE.
+    """
+    latest_by_meter: Dict[str, List[Dict[str, Any]]] = {meter_id: [] for meter_id in meter_ids}
+    if not meter_ids:
+        return latest_by_meter
+
+    try:
+        with db_cursor(readonly=True) as (conn, cur):
             cur.execute(
                 """
                 SELECT
-                    meter_id, timestamp,
-                    energy_kwh_import, voltage_vrn, current_ir
-                FROM readings
-                WHERE meter_id = %s AND timestamp >= %s AND timestamp <= %s
-                ORDER BY timestamp ASC;
+                    r.reading_id, r.meter_id, r.timestamp,
+                    r.voltage_vrn, r.voltage_vyn, r.voltage_vbn,
+                    r.current_ir, r.current_iy, r.current_ib,
+                    r.energy_kwh_import, r.energy_kvah_import, r.energy_kwh_export, r.energy_kvah_export,
+                    r.network_info, r.ingestion_time
+                FROM unnest(%s::varchar[]) AS m(meter_id)
+                CROSS JOIN LATERAL (
+                    SELECT *
+                    FROM readings
+                    WHERE readings.meter_id = m.meter_id
+                    ORDER BY readings.timestamp DESC
+                    LIMIT %s
+                ) AS r
+                ORDER BY r.meter_id, r.timestamp DESC;
                 """,
-                (meter_id, start_time_utc, end_time_utc)
+                (list(meter_ids), limit_count)
             )
-            readings = cur.fetchall()
-            
-            processed_readings = []
-            for row in readings:
-                row_dict = dict(row)
-                if 'timestamp' in row_dict and isinstance(row_dict['timestamp'], datetime):
-                    row_dict['timestamp'] = row_dict['timestamp'].astimezone(APP_TIMEZONE)
-                
-                # Convert Decimal fields to float
-                for key, value in row_dict.items():
-                    if isinstance(value, Decimal):
-                        row_dict[key] = float(value)
-                
-                processed_readings.append(row_dict)
+            for row_dict in _iter_converted_rows(cur):
+                latest_by_meter[row_dict['meter_id']].append(row_dict)
 
-            return processed_readings
+            logger.debug("Retrieved latest readings for %d meters in one query.", len(meter_ids))
+            return latest_by_meter
+    except Exception as e:
+        logger.error("Error fetching latest readings for meters %s: %s", meter_ids, e, exc_info=True)
+        return {meter_id: [] for meter_id in meter_ids}
+
+def iter_meter_readings_in_range(meter_id: str, start_time: datetime, end_time: datetime) -> Iterator[Dict[str, Any]]:
+    """
+    Streams meter readings for a given meter ID within a specified time range, oldest first.
+    Rows are fetched through a server-side (named) cursor in chunks of STREAM_ITERSIZE, so the
+    full result set is never buffered in client memory. Timestamps are converted to APP_TIMEZONE.
+    Errors are propagated to the caller.
+    """
+    with db_cursor(name=f"readings_{uuid.uuid4().hex}") as (conn, cur):
+        cur.itersize = STREAM_ITERSIZE
+        # Convert input times to UTC for database query consistency
+        start_time_utc = start_time.astimezone(timezone.utc)
+        end_time_utc = end_time.astimezone(timezone.utc)
+
+        cur.execute(
+            """
+            SELECT
+                meter_id, timestamp,
+                energy_kwh_import, voltage_vrn, current_ir
+            FROM readings
+            WHERE meter_id = %s AND timestamp >= %s AND timestamp <= %s
+            ORDER BY timestamp ASC;
+            """,
+            (meter_id, start_time_utc, end_time_utc)
+        )
+        yield from _iter_converted_rows(cur)
+
+def get_meter_readings_in_range(meter_id: str, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
+    """
+    Retrieves meter readings for a given meter ID within a specified time range.
+    Returns a list of dictionaries with essential reading columns for forecasting,
+    guaranteed oldest first (ORDER BY timestamp ASC), so callers can take the bounds
+    from [0] and [-1] without sorting. Timestamps are converted to APP_TIMEZONE.
+    """
+    try:
+        return list(iter_meter_readings_in_range(meter_id, start_time, end_time))
     except Exception as e:
-        logger.error(f"Error fetching historical readings for meter {meter_id} in range {start_time}-{end_time}: {e}", exc_info=True)
+        logger.error("Error fetching historical readings for meter %s in range %s-%s: %s", meter_id, start_time, end_time, e, exc_info=True)
         return []
-    finally:
-        if conn:
-            return_db_conn(conn)
+
+def get_meter_readings_range_bounds(meter_id: str, start_time: datetime,
+                                    end_time: datetime) -> Tuple[Optional[datetime], Optional[datetime], int]:
+    """
+    Returns (earliest timestamp, latest timestamp, row count) of a meter's readings within a
+    time range, aggregated by the server, for callers that only need to know what exists in
+    the range rather than the readings themselves. (None, None, 0) if the range is empty.
+    Errors are propagated to the caller.
+    """
+    with db_cursor(readonly=True) as (conn, cur):
+        # Runs before every backtest (see DigitalTwin._simulation_cache_key), so it is prepared
+        _execute_prepared(
+            cur, 'readings_range_bounds',
+            (meter_id, start_time.astimezone(timezone.utc), end_time.astimezone(timezone.utc))
+        )
+        earliest, latest, count = cur.fetchone()
+        return earliest, latest, count
+
+def get_meter_readings_columns(meter_id: str, start_time: datetime, end_time: datetime,
+                               value_columns: Sequence[str] = ('energy_kwh_import', 'voltage_vrn', 'current_ir'),
+                               changed_since: Optional[Tuple[datetime, datetime]] = None) -> Dict[str, List[Any]]:
+    """
+    Retrieves a meter's readings within a time range column-oriented: one list for 'timestamp'
+    and one per requested value column, oldest first, with NUMERIC values as float. Only the
+    requested columns are selected, and the rows are transposed once instead of being turned
+    into a dict each, which suits callers that load them into arrays or DataFrames.
+    If 'changed_since' is a (timestamp, ingestion_time) pair, only the readings in the range that
+    are newer than that timestamp or were ingested at or after that time are returned, e.g. to
+    top up an earlier fetch with readings scraped late. Returns empty lists on error.
+    """
+    column_names = ('timestamp',) + tuple(value_columns)
+    params = [meter_id, start_time.astimezone(timezone.utc), end_time.astimezone(timezone.utc)]
+    changed_condition = sql.SQL('')
+    if changed_since is not None:
+        changed_condition = sql.SQL(" AND (timestamp > %s OR ingestion_time >= %s)")
+        params.extend(value.astimezone(timezone.utc) for value in changed_since)
+    try:
+        with db_cursor(readonly=True) as (conn, cur):
+            cur.execute(
+                sql.SQL("""
+                    SELECT {columns}
+                    FROM readings
+                    WHERE meter_id = %s AND timestamp >= %s AND timestamp <= %s{changed_condition}
+                    ORDER BY timestamp ASC;
+                """).format(columns=sql.SQL(', ').join(map(sql.Identifier, column_names)),
+                            changed_condition=changed_condition),
+                params
+            )
+            rows = cur.fetchall()
+            numeric_indexes = set() if NUMERIC_AS_FLOAT else {
+                i for i, col in enumerate(cur.description) if col.type_code == NUMERIC_OID
+            }
+    except Exception as e:
+        logger.error("Error fetching historical readings for meter %s in range %s-%s: %s", meter_id, start_time, end_time, e, exc_info=True)
+        rows, numeric_indexes = [], set()
+
+    return _rows_to_columns(rows, column_names, numeric_indexes)
+
+def _rows_to_columns(rows: Sequence[tuple], column_names: Sequence[str], numeric_indexes) -> Dict[str, List[Any]]:
+    """Transposes fetched tuples into one list per column, converting the NUMERIC columns to float."""
+    columns = {name: list(values) for name, values in zip(column_names, zip(*rows))} if rows else {name: [] for name in column_names}
+    for i in numeric_indexes:
+        values = columns[column_names[i]]
+        columns[column_names[i]] = [None if value is None else float(value) for value in values]
+    return columns
+
+def rows_from_columns(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Turns column-oriented readings back into one dict per reading (e.g., for JSON responses)."""
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+def get_meter_readings_in_ranges_columns(meter_id: str, time_ranges: Sequence[Tuple[datetime, datetime]],
+                                         columns: Sequence[str] = READING_FORECAST_COLUMNS) -> List[Dict[str, List[Any]]]:
+    """
+    Retrieves meter readings for several time ranges of one meter with a single query, instead
+    of one round trip per range. Returns, per entry of 'time_ranges', the readings in that range
+    column-oriented (one list per name in 'columns', which must include 'timestamp'), oldest
+    first, with NUMERIC values as float; a reading inside overlapping ranges appears in each.
+    Timestamps are converted to APP_TIMEZONE. Returns empty columns on error.
+    """
+    if not time_ranges:
+        return []
+
+    range_conditions = sql.SQL(' OR ').join(
+        sql.SQL("(timestamp >= {} AND timestamp <= {})").format(sql.Placeholder(), sql.Placeholder())
+        for _ in time_ranges
+    )
+    params = [meter_id]
+    for start_time, end_time in time_ranges:
+        params.extend((start_time.astimezone(timezone.utc), end_time.astimezone(timezone.utc)))
+
+    try:
+        with db_cursor(readonly=True) as (conn, cur):
+            cur.execute(
+                sql.SQL("""
+                    SELECT {columns}
+                    FROM readings
+                    WHERE meter_id = %s AND ({range_conditions})
+                    ORDER BY timestamp ASC;
+                """).format(columns=sql.SQL(', ').join(map(sql.Identifier, columns)), range_conditions=range_conditions),
+                params
+            )
+            rows = cur.fetchall()
+            numeric_indexes = set() if NUMERIC_AS_FLOAT else {
+                i for i, col in enumerate(cur.description) if col.type_code == NUMERIC_OID
+            }
+    except Exception as e:
+        logger.error("Error fetching readings for meter %s in ranges %s: %s", meter_id, time_ranges, e, exc_info=True)
+        return [_rows_to_columns([], columns, ()) for _ in time_ranges]
+
+    # Split the merged, ordered result back into the requested ranges
+    timestamps = [row[columns.index('timestamp')] for row in rows]
+    return [
+        _rows_to_columns(rows[bisect.bisect_left(timestamps, start_time):bisect.bisect_right(timestamps, end_time)],
+                         columns, numeric_indexes)
+        for start_time, end_time in time_ranges
+    ]
+
+def get_meter_readings_in_ranges(meter_id: str, time_ranges: Sequence[Tuple[datetime, datetime]]) -> List[List[Dict[str, Any]]]:
+    """
+    Retrieves meter readings for several time ranges of one meter with a single query, instead
+    of one round trip per range. Returns one list per entry of 'time_ranges', each ordered by
+    timestamp; a reading inside overlapping ranges appears in each of them.
+    Timestamps are converted to APP_TIMEZONE.
+    """
+    return [rows_from_columns(columns) for columns in get_meter_readings_in_ranges_columns(meter_id, time_ranges)]
 
 def get_latest_forecast_run(meter_id: str) -> Optional[Dict[str, Any]]:
     """
     Retrieves the most recent forecast run record for a given meter ID.
     Timestamps in the result are converted to APP_TIMEZONE.
+    Results are cached for CACHE_TTL_SECONDS and invalidated whenever a run is inserted or updated.
     """
-    conn = None
+    hit, cached_run = _latest_forecast_run_cache.get(meter_id)
+    if hit:
+        return dict(cached_run) if cached_run is not None else None
+
     try:
-        conn = get_db_conn()
-        with conn.cursor(cursor_factory=DictCursor) as cur:
-            cur.execute(
-                """
-                SELECT
-                    run_id, meter_id, model_name, prediction_start_time, prediction_end_time,
-                    training_data_start, training_data_end, mae, rmse, run_timestamp
-                FROM forecast_runs
-                WHERE meter_id = %s
-                ORDER BY run_timestamp DESC
-                LIMIT 1;
-                """,
-                (meter_id,)
-            )
-            latest_run = cur.fetchone()
-            if latest_run:
-                # Convert DictRow to dict
-                result_dict = dict(latest_run)
-                
-                # Convert all relevant timestamps to APP_TIMEZONE
-                for key in ['prediction_start_time', 'prediction_end_time', 'training_data_start', 'training_data_end', 'run_timestamp']:
-                    if key in result_dict and isinstance(result_dict[key], datetime):
-                        result_dict[key] = result_dict[key].astimezone(APP_TIMEZONE)
-                
-                # Convert Decimal fields to float
-                for key in ['mae', 'rmse']:
-                    if key in result_dict and isinstance(result_dict[key], Decimal):
-                        result_dict[key] = float(result_dict[key])
-
-                return result_dict
-            return None
+        with db_cursor(readonly=True) as (conn, cur):
+            _execute_prepared(cur, 'latest_forecast_run', (meter_id,))
+            # Timestamps to APP_TIMEZONE, mae/rmse to float; None if the meter has no runs
+            latest_run = next(_iter_converted_rows(cur), None)
+            _latest_forecast_run_cache.set(meter_id, latest_run)
+            return dict(latest_run) if latest_run is not None else None
     except Exception as e:
-        logger.error(f"Error fetching latest forecast run for meter {meter_id}: {e}", exc_info=True)
+        logger.error("Error fetching latest forecast run for meter %s: %s", meter_id, e, exc_info=True)
         return None
-    finally:
-        if conn:
-            return_db_conn(conn)
 
 def get_forecast_predictions(run_id: str) -> List[Dict[str, Any]]:
     """
     Retrieves all forecast predictions for a given forecast run ID.
     Timestamps are converted to APP_TIMEZONE.
     """
-    conn = None
     try:
-        conn = get_db_conn()
-        with conn.cursor(cursor_factory=DictCursor) as cur:
+        # Server-side cursor: rows are streamed in chunks instead of buffered by fetchall()
+        with db_cursor(name=f"predictions_{uuid.uuid4().hex}") as (conn, cur):
+            cur.itersize = STREAM_ITERSIZE
             cur.execute(
                 """
                 SELECT
@@ -629,51 +1471,35 @@ def get_forecast_predictions(run_id: str) -> List[Dict[str, Any]]:
                 """,
                 (run_id,)
             )
-            predictions = cur.fetchall()
-            
-            processed_predictions = []
-            for row in predictions:
-                row_dict = dict(row)
-                if 'timestamp' in row_dict and isinstance(row_dict['timestamp'], datetime):
-                    row_dict['timestamp'] = row_dict['timestamp'].astimezone(APP_TIMEZONE)
-                
-                # Convert Decimal fields to float
-                for key in ['predicted_kwh', 'actual_kwh']:
-                    if key in row_dict and isinstance(row_dict[key], Decimal):
-                        row_dict[key] = float(row_dict[key])
-                
-                processed_predictions.append(row_dict)
-
-            return processed_predictions
+
+            return list(_iter_converted_rows(cur))
     except Exception as e:
-        logger.error(f"Error fetching forecast predictions for run {run_id}: {e}", exc_info=True)
+        logger.error("Error fetching forecast predictions for run %s: %s", run_id, e, exc_info=True)
         return []
-    finally:
-        if conn:
-            return_db_conn(conn)
 
 def get_all_meter_details() -> List[Dict[str, Any]]:
     """
     Retrieves details for all meters in the database.
+    Results are cached for CACHE_TTL_SECONDS and invalidated by insert_meter_details.
     """
-    conn = None
+    hit, cached_meters = _meter_details_cache.get('all')
+    if hit:
+        return [dict(meter) for meter in cached_meters]
+
     try:
-        conn = get_db_conn()
-        with conn.cursor(cursor_factory=DictCursor) as cur:
+        with db_cursor(readonly=True) as (conn, cur):
             cur.execute(
                 """
                 SELECT meter_id, meter_no, location FROM meters ORDER BY meter_no ASC;
                 """
             )
-            meters = cur.fetchall()
             # No Decimal or complex datetime conversions typically needed here, but keeping it consistent
-            return [dict(row) for row in meters]
+            meter_details = list(_iter_converted_rows(cur))
+            _meter_details_cache.set('all', meter_details)
+            return [dict(meter) for meter in meter_details]
     except Exception as e:
-        logger.error(f"Error fetching all meter details: {e}", exc_info=True)
+        logger.error("Error fetching all meter details: %s", e, exc_info=True)
         return []
-    finally:
-        if conn:
-            return_db_conn(conn)
 
 # This __main__ block is intentionally minimal as main.py handles global setup.
 # It's primarily for quick, isolated testing of db_manager functions.
@@ -692,7 +1518,7 @@ if __name__ == '__main__':
         create_tables() # Ensure tables exist for testing
 
         # --- Basic Test Sequence ---
-        test_meter_id = "test_meter_" + str(uuid.uuid4())[:8] # Unique ID for testing
+        test_meter_id = "test_meter_" + uuid.uuid4().hex[:8] # Unique ID for testing
         test_meter_no = "TM-XYZ-999"
         test_location = "Test Lab"
 
@@ -736,7 +1562,7 @@ if __name__ == '__main__':
         pred_end = now_app_tz + timedelta(hours=1, minutes=15)
 
         # Note: MAE/RMSE are mock values for this test as there's no actual model run
-        test_run_id = str(uuid.uuid4()) # Generate UUID here, pass as string
+        test_run_id = new_run_id()
         insert_forecast_run(
             run_id=test_run_id, # Pass the generated run_id
             meter_id=test_meter_id, model_name="test_model",
@@ -752,6 +1578,7 @@ if __name__ == '__main__':
         ]
         insert_forecast_predictions(test_run_id, test_predictions)
         update_forecast_run_metrics(test_run_id, 0.6, 0.8) # Update with some mock metrics
+        refresh_forecast_run_metrics(test_run_id) # Recompute from whatever readings exist for the window
 
         # Test get_latest_forecast_run and get_forecast_predictions
         latest_run = get_latest_forecast_run(test_meter_id)
@@ -1,15 +1,130 @@
 import logging
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, List, Optional
-import uuid
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
 
 # Assuming db_manager and forecasting_engine are in src/
 from . import db_manager
-from .forecasting_engine import BaseForecastingModel, load_forecasting_model, calculate_forecast_metrics
+from .forecasting_engine import BaseForecastingModel, load_forecasting_model, calculate_forecast_metrics_from_arrays, clear_model_registry
+from .models.base_model import READING_FRAME_COLUMNS, forecast_records, reading_columns_to_frame
 
 logger = logging.getLogger(__name__)
 
+# The application timezone never changes at runtime, so look it up once
+_APP_TZ = db_manager.get_timezone()
+
+# Runs the database fetches of a simulation concurrently with model loading, training and
+# prediction. psycopg2 releases the GIL while waiting on the server, so the I/O overlaps.
+_SIMULATION_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='twin-io')
+
+# Predictions are matched to actual readings by 15-minute slot (the same slots the server-side
+# actuals join in db_manager uses)
+ALIGNMENT_BUCKET_SECONDS = db_manager.ACTUALS_SLOT_SECONDS
+# Interval between the predictions a simulation asks its model for
+PREDICTION_FREQUENCY = timedelta(minutes=30)
+
+def _time_buckets(timestamps: Union[List[datetime], pd.DatetimeIndex]) -> np.ndarray:
+    """
+    Maps timezone-aware timestamps to their 15-minute slot numbers since the epoch, as int64.
+    The list is converted once to a UTC datetime64 array, so the slots come from vectorized
+    integer arithmetic instead of a timestamp() call per element, and match regardless of the
+    tzinfo implementation (pytz, zoneinfo or UTC) attached to either side.
+    """
+    epoch_seconds = pd.to_datetime(timestamps, utc=True).values.astype('datetime64[s]').view(np.int64)
+    return epoch_seconds // ALIGNMENT_BUCKET_SECONDS
+
+# Results of backtests (explicit prediction windows), keyed by their inputs and the latest timestamp
+# and count of the readings they cover, so a new or back-filled reading invalidates them.
+# Entries also expire after 15 minutes because the training window ends at "now".
+SIMULATION_RESULT_CACHE = db_manager.TTLCache(ttl=15 * 60, maxsize=256)
+
+# Training-history frames per meter, as (frame, window_start, window_end, fetched_at). Later
+# fetches whose window starts inside a cached one only query the readings after window_end plus
+# those ingested since fetched_at, as the scraper inserts readings after their timestamp. Entries
+# are not extended in place, so each hit re-reads every reading ingested since the full fetch.
+HISTORY_FRAME_CACHE = db_manager.TTLCache(ttl=15 * 60, maxsize=64)
+_INGESTION_CLOCK_MARGIN = timedelta(minutes=1)
+
+# Trained models keyed by (meter, model, event, first/last history timestamp, row count). A twin
+# given the same training history and event reuses the fitted model instead of retraining;
+# predict() does not mutate a trained model, so instances are shared read-only.
+TRAINED_MODEL_CACHE = db_manager.TTLCache(ttl=15 * 60, maxsize=32)
+
+def _training_cache_key(meter_id: str, model_name: str, history_frame: pd.DataFrame,
+                        event_data: Optional[Dict[str, Any]]) -> Optional[Tuple]:
+    """Returns the TRAINED_MODEL_CACHE key for a training run, or None if it cannot be keyed."""
+    try:
+        event_key = tuple(sorted((event_data or {}).items()))
+        hash(event_key)
+    except TypeError:
+        return None
+    return (meter_id, model_name, event_key, history_frame.index[0], history_frame.index[-1], len(history_frame))
+
+def _next_quarter_hour(ts: datetime) -> datetime:
+    """
+    Returns the first 15-minute boundary strictly after 'ts', keeping its tzinfo.
+    A reading at 10:00 yields 10:15; a reading at 10:07:30 yields 10:15 as well.
+    The boundary is one integer expression on epoch seconds, converted back through the
+    tzinfo, so it has no branches and stays correct across UTC offset changes.
+    """
+    next_slot = (int(ts.timestamp()) // ALIGNMENT_BUCKET_SECONDS + 1) * ALIGNMENT_BUCKET_SECONDS
+    return datetime.fromtimestamp(next_slot, tz=ts.tzinfo)
+
+def _aligned_actual_values(prediction_timestamps: pd.DatetimeIndex, actuals: List[Dict[str, Any]],
+                           start: Optional[datetime] = None, frequency: Optional[timedelta] = None) -> np.ndarray:
+    """
+    Returns a float64 array holding, for each prediction timestamp (as returned by a model's
+    predict_arrays()), the actual reading in the same 15-minute slot (NaN where no reading
+    exists). Slots are matched with np.searchsorted, so 'actuals' must be ordered by
+    timestamp; where several readings share a slot, the first one is used.
+
+    When the timestamps are the regular grid start, start + frequency, ... (as models produce
+    from pd.date_range) and 'frequency' is a whole number of slots, prediction i lies in slot
+    start_slot + i * (frequency / slot), so each actual's prediction index is computed directly
+    and the prediction timestamps are never searched. Otherwise the DatetimeIndex is bucketed
+    as a whole, without extracting a Python datetime per prediction.
+    """
+    aligned = np.full(len(prediction_timestamps), np.nan, dtype=np.float64)
+    if not len(prediction_timestamps) or not actuals:
+        return aligned
+    actual_slots = _time_buckets([a['timestamp'] for a in actuals])
+    actual_kwh = np.fromiter((np.nan if a['energy_kwh_import'] is None else a['energy_kwh_import'] for a in actuals),
+                             dtype=np.float64, count=len(actuals))
+
+    slots_per_step, remainder = divmod(int(frequency.total_seconds()), ALIGNMENT_BUCKET_SECONDS) if frequency else (0, 1)
+    on_grid = (start is not None and slots_per_step > 0 and remainder == 0
+               and prediction_timestamps[0] == start
+               and prediction_timestamps[-1] == start + (len(prediction_timestamps) - 1) * frequency)
+    if on_grid:
+        # Keep the first reading of each slot, then map the slot offsets onto prediction indexes
+        actual_slots, first = np.unique(actual_slots, return_index=True)
+        offsets = actual_slots - _time_buckets([start])[0]
+        pred_idx, step_remainder = np.divmod(offsets, slots_per_step)
+        matched = (offsets >= 0) & (step_remainder == 0) & (pred_idx < len(prediction_timestamps))
+        aligned[pred_idx[matched]] = actual_kwh[first[matched]]
+        return aligned
+
+    pred_slots = _time_buckets(prediction_timestamps)
+    idx = np.searchsorted(actual_slots, pred_slots)
+    matched = idx < len(actual_slots)
+    matched[matched] = actual_slots[idx[matched]] == pred_slots[matched]
+    aligned[matched] = actual_kwh[idx[matched]]
+    return aligned
+
+@lru_cache(maxsize=8)
+def _load_cached(model_name: str) -> BaseForecastingModel:
+    """
+    Loads each forecasting model at most once per process. The returned instance is a shared
+    template: callers that train must work on template.clone().
+    """
+    return load_forecasting_model(model_name)
+
 class DigitalTwin:
     """
     The core simulation engine for the digital twin.
@@ -20,52 +135,121 @@ class DigitalTwin:
         self.meter_id = meter_id
         self.forecasting_model: Optional[BaseForecastingModel] = None
         self.latest_real_reading: Optional[Dict[str, Any]] = None
-        logger.info(f"DigitalTwin initialized for Meter ID: {self.meter_id}")
+        # (start, end) requested by the most recent history fetch
+        self.last_history_window: Optional[tuple] = None
+        logger.info("DigitalTwin initialized for Meter ID: %s", self.meter_id)
 
     def load_model(self, model_name: str):
         """Loads a specific forecasting model into the digital twin."""
         try:
-            self.forecasting_model = load_forecasting_model(model_name)
-            logger.info(f"Forecasting model '{model_name}' loaded for Meter {self.meter_id}.")
+            self.forecasting_model = _load_cached(model_name).clone()
+            logger.info("Forecasting model '%s' loaded for Meter %s.", model_name, self.meter_id)
         except ValueError as e:
-            logger.error(f"Failed to load model for Meter {self.meter_id}: {e}")
+            logger.error("Failed to load model for Meter %s: %s", self.meter_id, e)
             raise
 
+    def clear_model_cache(self):
+        """
+        Drops this twin's loaded model, the process-wide model templates and the resolved model
+        classes, so the next load_model() constructs the model afresh (e.g., after a model's
+        files have changed or a new model was added). The trained models and simulation results
+        produced by the old templates are dropped as well, so no later simulation reuses them.
+        """
+        self.forecasting_model = None
+        _load_cached.cache_clear()
+        clear_model_registry()
+        TRAINED_MODEL_CACHE.clear()
+        SIMULATION_RESULT_CACHE.clear()
+
+    @staticmethod
+    def clear_training_cache():
+        """Drops every cached trained model, forcing the next simulation to retrain."""
+        TRAINED_MODEL_CACHE.clear()
+
     def get_latest_real_reading(self) -> Optional[Dict[str, Any]]:
         """Retrieves the latest real meter reading from the database."""
-        logger.info(f"Fetching latest real reading for Meter {self.meter_id}...")
+        logger.info("Fetching latest real reading for Meter %s...", self.meter_id)
         try:
             latest_readings = db_manager.get_latest_meter_readings_by_limit(self.meter_id, 1)
             if latest_readings:
                 self.latest_real_reading = latest_readings[0]
-                logger.info(f"Latest real reading for Meter {self.meter_id}: {self.latest_real_reading.get('energy_kwh_import')} kWh at {self.latest_real_reading.get('timestamp')}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Latest real reading for Meter %s: %s kWh at %s", self.meter_id,
+                                self.latest_real_reading.get('energy_kwh_import'), self.latest_real_reading.get('timestamp'))
                 return self.latest_real_reading
             else:
-                logger.warning(f"No real readings found for Meter {self.meter_id} in the database.")
+                logger.warning("No real readings found for Meter %s in the database.", self.meter_id)
                 return None
         except Exception as e:
-            logger.error(f"Error fetching latest real reading for Meter {self.meter_id}: {e}", exc_info=True)
+            # Transient DB errors can recur many times; only pay for the traceback when debugging
+            logger.error("Error fetching latest real reading for Meter %s: %s", self.meter_id, e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return None
 
-    def get_historical_data(self, hours: int = 24) -> List[Dict[str, Any]]:
+    def _historical_window(self, hours: int, now_tz: Optional[datetime] = None):
+        """Returns the (start, end) of the 'hours'-long history window ending at now_tz (default: now)."""
+        end_time = now_tz if now_tz is not None else datetime.now(_APP_TZ).replace(second=0, microsecond=0)
+        return end_time - timedelta(hours=hours), end_time
+
+    def get_historical_data(self, hours: int = 24, now_tz: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """
         Retrieves historical data for training models or analysis.
         Args:
             hours (int): Number of hours of historical data to retrieve.
+            now_tz (Optional[datetime]): End of the window; defaults to the current minute.
         Returns:
-            List[Dict[str, Any]]: List of historical meter readings.
+            List[Dict[str, Any]]: List of historical meter readings, oldest first.
+            The requested (start, end) is kept in self.last_history_window.
         """
-        end_time = datetime.now(db_manager.get_timezone()).replace(second=0, microsecond=0)
-        start_time = end_time - timedelta(hours=hours)
-        logger.info(f"Fetching {hours} hours of historical data for Meter {self.meter_id} from {start_time} to {end_time}...")
+        start_time, end_time = self._historical_window(hours, now_tz)
+        self.last_history_window = (start_time, end_time)
+        logger.info("Fetching %d hours of historical data for Meter %s from %s to %s...", hours, self.meter_id, start_time, end_time)
         try:
             historical_data = db_manager.get_meter_readings_in_range(self.meter_id, start_time, end_time)
-            logger.info(f"Retrieved {len(historical_data)} historical data points for Meter {self.meter_id}.")
+            logger.info("Retrieved %d historical data points for Meter %s.", len(historical_data), self.meter_id)
             return historical_data
         except Exception as e:
-            logger.error(f"Error fetching historical data for Meter {self.meter_id}: {e}", exc_info=True)
+            logger.error("Error fetching historical data for Meter %s: %s", self.meter_id, e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return []
 
+    def get_historical_frame(self, hours: int = 24, now_tz: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Like get_historical_data, but returns the readings as a readings_to_frame()-style
+        DataFrame (UTC index, float64 columns), fetched column-oriented so no per-row dicts
+        are built. Repeated calls for a meter reuse HISTORY_FRAME_CACHE and only fetch the
+        readings newer than the cached window or ingested since it was fetched. Empty on error.
+        The requested (start, end) is kept in self.last_history_window.
+        """
+        start_time, end_time = self._historical_window(hours, now_tz)
+        self.last_history_window = (start_time, end_time)
+        logger.info("Fetching %d hours of historical data for Meter %s from %s to %s...", hours, self.meter_id, start_time, end_time)
+        value_columns = tuple(READING_FRAME_COLUMNS)
+        hit, cached = HISTORY_FRAME_CACHE.get(self.meter_id)
+        if hit and cached[1] <= start_time and cached[2] <= end_time:
+            cached_frame, _, cached_end, fetched_at = cached
+            # New are the readings after the cached window, and any reading (late-scraped ones
+            # included) ingested since the full fetch; re-fetched readings replace cached rows
+            delta_frame = reading_columns_to_frame(
+                db_manager.get_meter_readings_columns(self.meter_id, start_time, end_time, value_columns=value_columns,
+                                                      changed_since=(cached_end, fetched_at))
+            )
+            history_frame = cached_frame.loc[pd.Timestamp(start_time).tz_convert('UTC'):]
+            if not delta_frame.empty:
+                history_frame = pd.concat([history_frame, delta_frame])
+                history_frame = history_frame[~history_frame.index.duplicated(keep='last')].sort_index()
+            logger.info("Retrieved %d historical data points for Meter %s (%d newly fetched).", len(history_frame), self.meter_id, len(delta_frame))
+            return history_frame
+
+        # Taken before the query and backed off by a margin for clock skew against the database,
+        # so a reading committed while the query runs is re-read on the next hit rather than lost
+        fetched_at = datetime.now(timezone.utc) - _INGESTION_CLOCK_MARGIN
+        history_frame = reading_columns_to_frame(
+            db_manager.get_meter_readings_columns(self.meter_id, start_time, end_time, value_columns=value_columns)
+        )
+        if not history_frame.empty:
+            HISTORY_FRAME_CACHE.set(self.meter_id, (history_frame, start_time, end_time, fetched_at))
+        logger.info("Retrieved %d historical data points for Meter %s.", len(history_frame), self.meter_id)
+        return history_frame
+
     # In src/digital_twin.py
 
     def run_simulation(self,
@@ -75,7 +259,8 @@ class DigitalTwin:
                    prediction_horizon_hours: int = 24,
                    event_data: Optional[Dict[str, Any]] = None,
                    explicit_prediction_start_time: Optional[datetime] = None,
-                   explicit_prediction_end_time: Optional[datetime] = None) -> Dict[str, Any]:
+                   explicit_prediction_end_time: Optional[datetime] = None,
+                   include_actuals: bool = True) -> Dict[str, Any]:
         """
         Runs a comprehensive simulation of energy demand.
 
@@ -96,101 +281,290 @@ class DigitalTwin:
                                         e.g., {'type': 'heatwave', 'value': 5}
             explicit_prediction_start_time (Optional[datetime]): The start time for a backtest.
             explicit_prediction_end_time (Optional[datetime]): The end time for a backtest.
+            include_actuals (bool): Whether to fetch and return the actual readings in the window.
+                                    If False, PostgreSQL joins the actuals to the stored predictions
+                                    and computes the metrics itself, saving the actuals query.
 
         Returns:
             A dictionary containing the full results of the simulation.
         """
+        # One snapshot of "now" for the whole run (cache key included), so every window is
+        # derived from the same instant
+        now_tz = datetime.now(_APP_TZ).replace(second=0, microsecond=0)
+
+        result_cache_key = None
+        if explicit_prediction_start_time and explicit_prediction_end_time:
+            result_cache_key = self._simulation_cache_key(
+                model_name, data_for_training_hours, event_data, include_actuals,
+                explicit_prediction_start_time, explicit_prediction_end_time, now_tz
+            )
+            if result_cache_key is not None:
+                hit, cached_result = SIMULATION_RESULT_CACHE.get(result_cache_key)
+                if hit:
+                    logger.info("Returning cached simulation result (run %s) for Meter %s.", cached_result['run_id'], self.meter_id)
+                    # Callers post-process the metrics in place, so hand out copies
+                    return {**cached_result, "metrics": dict(cached_result["metrics"])}
+
         if event_data:
-            logger.info(f"Starting EVENT simulation for Meter {self.meter_id} | Model: '{model_name}' | Event: {event_data}")
+            logger.info("Starting EVENT simulation for Meter %s | Model: '%s' | Event: %s", self.meter_id, model_name, event_data)
         else:
-            logger.info(f"Starting simulation for Meter {self.meter_id} | Model: '{model_name}'")
-
-        # 1. FETCH HISTORICAL DATA
-        historical_data = self.get_historical_data(hours=data_for_training_hours)
-        if not historical_data:
+            logger.info("Starting simulation for Meter %s | Model: '%s'", self.meter_id, model_name)
+
+        # 1. FETCH HISTORICAL DATA, loading the requested model's cached template in the background meanwhile
+        model_template_future = _SIMULATION_EXECUTOR.submit(_load_cached, model_name)
+        prefetched_actuals = None
+        if include_actuals and explicit_prediction_start_time and explicit_prediction_end_time:
+            # Backtest: both windows are known up front, so fetch them in one round trip
+            history_start, history_end = self._historical_window(data_for_training_hours, now_tz)
+            self.last_history_window = (history_start, history_end)
+            history_columns, actual_columns = db_manager.get_meter_readings_in_ranges_columns(
+                self.meter_id,
+                [(history_start, history_end), (explicit_prediction_start_time, explicit_prediction_end_time)]
+            )
+            # History goes column-wise into the model frame; only the returned actuals become dicts
+            history_frame = reading_columns_to_frame(history_columns)
+            prefetched_actuals = db_manager.rows_from_columns(actual_columns)
+            logger.info("Retrieved %d historical and %d actual data points for Meter %s in one query.", len(history_frame), len(prefetched_actuals), self.meter_id)
+        else:
+            # Columnar fetch straight into the frame that train() and predict() share
+            history_frame = self.get_historical_frame(hours=data_for_training_hours, now_tz=now_tz)
+        if history_frame.empty:
             # It's impossible to run any meaningful simulation without some data.
             raise ValueError("Not enough historical data to run a simulation. Please scrape more data first.")
+        # Record the intended training window rather than whichever rows happened to exist in it
+        training_data_start, training_data_end = self.last_history_window
+
+        # 2. DEFINE SIMULATION TIME WINDOW
+        if explicit_prediction_start_time and explicit_prediction_end_time:
+            prediction_start_time = explicit_prediction_start_time
+            prediction_end_time = explicit_prediction_end_time
+            logger.info("Using explicit backtest window: %s to %s", prediction_start_time, prediction_end_time)
+        else:
+            # Standard forecast logic
+            # The frame is ordered by timestamp, so its last reading is the most recent.
+            # Start on the next quarter-hour slot so predictions line up with meter readings.
+            prediction_start_time = _next_quarter_hour(history_frame.index[-1].tz_convert(_APP_TZ).to_pydatetime())
+            prediction_end_time = prediction_start_time + timedelta(hours=prediction_horizon_hours)
+            logger.info("Inferred forecast window: %s to %s", prediction_start_time, prediction_end_time)
+
+        if prediction_start_time >= prediction_end_time:
+            raise ValueError("Prediction start time cannot be on or after the end time.")
+
+        # Fetch the actuals for evaluation (unless already prefetched) while the model trains and predicts
+        actuals_future = None
+        if include_actuals and prefetched_actuals is None and prediction_start_time > now_tz:
+            # A strictly future window cannot have actual readings yet; skip the query
+            prefetched_actuals = []
+        elif include_actuals and prefetched_actuals is None and not explicit_prediction_start_time:
+            # An inferred window starts after the last reading of a history fetched up to now_tz,
+            # so the history query has already shown that no readings exist in it
+            prefetched_actuals = []
+        elif include_actuals and prefetched_actuals is None:
+            # A window running past now_tz can only have readings up to now_tz, so the scan stops there
+            actuals_future = _SIMULATION_EXECUTOR.submit(
+                db_manager.get_meter_readings_in_range, self.meter_id, prediction_start_time, min(prediction_end_time, now_tz)
+            )
+
+        # 3-4. DECIDE WHICH MODEL TO USE, THEN LOAD AND TRAIN IT
+        model_to_use, fallback_reason = self._prepare_model(model_name, model_template_future, history_frame, event_data)
+
+        # 5-8. PREDICT, EVALUATE, RECORD AND RETURN
+        simulation_result = self._predict_and_store(
+            model_name, model_to_use, fallback_reason, history_frame,
+            prediction_start_time, prediction_end_time, event_data, include_actuals,
+            (training_data_start, training_data_end),
+            actuals=prefetched_actuals, actuals_future=actuals_future
+        )
+        if result_cache_key is not None:
+            SIMULATION_RESULT_CACHE.set(result_cache_key, {**simulation_result, "metrics": dict(simulation_result["metrics"])})
+        return simulation_result
+
+    def run_simulations_batch(self,
+                              model_name: str,
+                              data_for_training_hours: int,
+                              windows: List[Tuple[datetime, datetime]],
+                              event_data: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Runs one backtest per (start, end) prediction window against a single trained model.
+
+        The training history and the actuals of every window are fetched in one query, and the
+        model is loaded and trained once; only prediction and evaluation are repeated per window.
+        Each window is recorded as its own forecast run, all in one transaction.
+
+        Args:
+            model_name (str): The name of the forecasting model to use.
+            data_for_training_hours (int): Hours of historical data for training.
+            windows (List[Tuple[datetime, datetime]]): The prediction windows to backtest.
+            event_data (Optional[Dict]): An optional event applied to training and every window.
+
+        Returns:
+            One run_simulation()-style result dictionary per window, in the order given.
+        """
+        if not windows:
+            return []
+        for start_time, end_time in windows:
+            if start_time >= end_time:
+                raise ValueError("Prediction start time cannot be on or after the end time.")
+        logger.info("Starting batch of %d simulations for Meter %s | Model: '%s'", len(windows), self.meter_id, model_name)
+
+        now_tz = datetime.now(_APP_TZ).replace(second=0, microsecond=0)
+        model_template_future = _SIMULATION_EXECUTOR.submit(_load_cached, model_name)
+        history_start, history_end = self._historical_window(data_for_training_hours, now_tz)
+        self.last_history_window = (history_start, history_end)
+        history_columns, *window_columns = db_manager.get_meter_readings_in_ranges_columns(
+            self.meter_id, [(history_start, history_end)] + list(windows)
+        )
+        history_frame = reading_columns_to_frame(history_columns)
+        window_actuals = [db_manager.rows_from_columns(columns) for columns in window_columns]
+        if history_frame.empty:
+            raise ValueError("Not enough historical data to run a simulation. Please scrape more data first.")
 
-        # 2. DECIDE WHICH MODEL TO USE (GRACEFUL FALLBACK)
+        model_to_use, fallback_reason = self._prepare_model(model_name, model_template_future, history_frame, event_data)
+        pending_runs = []
+        results = [
+            self._predict_and_store(
+                model_name, model_to_use, fallback_reason, history_frame,
+                start_time, end_time, event_data, True, (history_start, history_end),
+                actuals=actuals, pending_runs=pending_runs
+            )
+            for (start_time, end_time), actuals in zip(windows, window_actuals)
+        ]
+        # Every window's run is written on one connection and committed together
+        db_manager.insert_forecast_runs_with_predictions(pending_runs)
+        return results
+
+    def _prepare_model(self, model_name: str, model_template_future: Future,
+                       history_frame: pd.DataFrame, event_data: Optional[Dict[str, Any]]) -> Tuple[str, Optional[str]]:
+        """
+        Picks the model to run (falling back to the baseline if 'model_name' cannot load or lacks
+        history), loads it into self.forecasting_model and trains it on 'history_frame'.
+        Returns (model_to_use, fallback_reason).
+        """
+        # DECIDE WHICH MODEL TO USE (GRACEFUL FALLBACK)
         model_to_use = model_name
         fallback_reason = None
         try:
-            requested_model_instance = load_forecasting_model(model_name)
-            required_records = requested_model_instance.get_required_history_count()
-            if len(historical_data) < required_records:
-                fallback_reason = (f"Insufficient data for '{model_name}' (had {len(historical_data)} of {required_records} required). Used baseline instead.")
+            # The template is the one load_model() clones below, so the check costs no extra load
+            required_records = model_template_future.result().get_required_history_count()
+            if len(history_frame) < required_records:
+                fallback_reason = (f"Insufficient data for '{model_name}' (had {len(history_frame)} of {required_records} required). Used baseline instead.")
                 logger.warning(fallback_reason)
                 model_to_use = "baseline_model"
         except Exception as e:
             fallback_reason = f"Could not load requested model '{model_name}'. Used baseline instead. Error: {e}"
-            logger.error(fallback_reason, exc_info=True)
+            logger.error(fallback_reason, exc_info=logger.isEnabledFor(logging.DEBUG))
             model_to_use = "baseline_model"
 
-        # 3. LOAD & TRAIN THE FINAL MODEL
+        # REUSE A MODEL ALREADY TRAINED ON THIS EXACT HISTORY AND EVENT
+        training_key = _training_cache_key(self.meter_id, model_to_use, history_frame, event_data)
+        if training_key is not None:
+            hit, trained_model = TRAINED_MODEL_CACHE.get(training_key)
+            if hit:
+                logger.info("Reusing trained '%s' model for Meter %s.", model_to_use, self.meter_id)
+                self.forecasting_model = trained_model
+                return model_to_use, fallback_reason
+
+        # LOAD & TRAIN THE FINAL MODEL
         # Pass params to load_model if we add hyperparameter tuning back in the future.
-        self.load_model(model_to_use) 
+        try:
+            self.load_model(model_to_use)
+        except Exception as e:
+            if model_to_use == "baseline_model":
+                raise
+            fallback_reason = f"Could not load requested model '{model_name}'. Used baseline instead. Error: {e}"
+            logger.error(fallback_reason, exc_info=logger.isEnabledFor(logging.DEBUG))
+            model_to_use = "baseline_model"
+            self.load_model(model_to_use)
         if not self.forecasting_model:
             raise RuntimeError("Fatal: Could not load any forecasting model, including the baseline.")
-        
-        # Pass event data to the training step. This is crucial for events that modify 'kwh'.
-        self.forecasting_model.train(historical_data, event_data=event_data)
-        training_data_start = historical_data[0]['timestamp']
-        training_data_end = historical_data[-1]['timestamp']
 
-        # 4. DEFINE SIMULATION TIME WINDOW
-        if explicit_prediction_start_time and explicit_prediction_end_time:
-            prediction_start_time = explicit_prediction_start_time
-            prediction_end_time = explicit_prediction_end_time
-            logger.info(f"Using explicit backtest window: {prediction_start_time} to {prediction_end_time}")
-        else:
-            # Standard forecast logic
-            last_historical_timestamp = max(d['timestamp'] for d in historical_data)
-            prediction_start_time = last_historical_timestamp + timedelta(minutes=15)
-            prediction_end_time = prediction_start_time + timedelta(hours=prediction_horizon_hours)
-            logger.info(f"Inferred forecast window: {prediction_start_time} to {prediction_end_time}")
-
-        if prediction_start_time >= prediction_end_time:
-            raise ValueError("Prediction start time cannot be on or after the end time.")
-
-        # 5. RECORD THE FORECAST RUN
-        current_run_id = str(uuid.uuid4())
-        db_manager.insert_forecast_run(
-            run_id=current_run_id, meter_id=self.meter_id, model_name=model_to_use,
-            prediction_start_time=prediction_start_time, prediction_end_time=prediction_end_time,
-            training_data_start=training_data_start, training_data_end=training_data_end
-        )
-        logger.info(f"New forecast run initiated with ID: {current_run_id}")
+        # Pass event data to the training step. This is crucial for events that modify 'kwh'.
+        self.forecasting_model.train(history_frame, event_data=event_data)
+        if training_key is not None and getattr(self.forecasting_model, 'is_trained', True):
+            # Keyed on the model actually loaded; a load-time fallback changes model_to_use
+            TRAINED_MODEL_CACHE.set(
+                _training_cache_key(self.meter_id, model_to_use, history_frame, event_data),
+                self.forecasting_model
+            )
+        return model_to_use, fallback_reason
+
+    def _predict_and_store(self, model_name: str, model_to_use: str, fallback_reason: Optional[str],
+                           history_frame: pd.DataFrame, prediction_start_time: datetime, prediction_end_time: datetime,
+                           event_data: Optional[Dict[str, Any]], include_actuals: bool,
+                           training_window: Tuple[datetime, datetime],
+                           actuals: Optional[List[Dict[str, Any]]] = None,
+                           actuals_future: Optional[Future] = None,
+                           pending_runs: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Predicts one window with the trained self.forecasting_model, evaluates it against the
+        actuals (given directly or as a pending query), records the forecast run and returns
+        the simulation result dictionary. With include_actuals and a 'pending_runs' list, the
+        run is appended there for db_manager.insert_forecast_runs_with_predictions() instead.
+        """
+        training_data_start, training_data_end = training_window
+        current_run_id = db_manager.new_run_id() # Time-ordered, so run inserts stay index-local
 
-        # 6. GENERATE FORECASTS
-        simulated_readings_output = self.forecasting_model.predict(
+        # GENERATE FORECASTS
+        # As arrays, so the metrics use the predicted values without reading them back out of dicts
+        prediction_timestamps, predicted_values = self.forecasting_model.predict_arrays(
             start_timestamp=prediction_start_time,
             end_timestamp=prediction_end_time,
-            historical_data=historical_data,
-            frequency=timedelta(minutes=30),
+            historical_data=history_frame,
+            frequency=PREDICTION_FREQUENCY,
             event_data=event_data # Pass event data to the prediction step
         )
-        logger.info(f"Generated {len(simulated_readings_output)} simulated readings.")
-
-        # 7. EVALUATE & STORE RESULTS
-        actuals_in_simulation_range = db_manager.get_meter_readings_in_range(
-            self.meter_id, prediction_start_time, prediction_end_time
-        )
-        metrics = calculate_forecast_metrics(actuals_in_simulation_range, simulated_readings_output)
-        
-        predictions_to_store = []
-        actual_map = {a['timestamp']: a['energy_kwh_import'] for a in actuals_in_simulation_range}
-        for pred in simulated_readings_output:
-            predictions_to_store.append({
-                'timestamp': pred['timestamp'],
-                'predicted_kwh': pred['predicted_kwh'],
-                'actual_kwh': actual_map.get(pred['timestamp'])
-            })
-        
-        db_manager.insert_forecast_predictions(current_run_id, predictions_to_store)
-        if metrics.get('mae') is not None:
-            db_manager.update_forecast_run_metrics(current_run_id, mae=metrics.get('mae'), rmse=metrics.get('rmse'))
-
-        # 8. RETURN COMPLETE RESULTS
+        simulated_readings_output = forecast_records(prediction_timestamps, predicted_values)
+        logger.info("Generated %d simulated readings.", len(simulated_readings_output))
+
+        if include_actuals:
+            # EVALUATE
+            # The actuals query was submitted before training and has been running alongside
+            # train() and predict(); it is only waited on here, where its result is first needed.
+            actuals_in_simulation_range = actuals_future.result() if actuals_future else actuals
+            # Predictions are matched to actuals by 15-minute slot; missing actuals are NaN and
+            # are skipped by the metrics.
+            actual_values = _aligned_actual_values(prediction_timestamps, actuals_in_simulation_range,
+                                                   prediction_start_time, PREDICTION_FREQUENCY)
+            if actuals_in_simulation_range:
+                metrics = calculate_forecast_metrics_from_arrays(actual_values, predicted_values)
+            else:
+                # Nothing to evaluate against yet (e.g., a forward-looking forecast)
+                metrics = {"mae": float('nan'), "rmse": float('nan')}
+
+            # Rows are generated while being inserted; the predictions are not copied into a second list.
+            # The aligned actuals are reused from the metrics step and turned into Python floats in one
+            # tolist() pass; NaN (no actual) is the only value unequal to itself.
+            predictions_to_store = (
+                {'timestamp': pred['timestamp'], 'predicted_kwh': pred['predicted_kwh'],
+                 'actual_kwh': actual if actual == actual else None}
+                for pred, actual in zip(simulated_readings_output, actual_values.tolist())
+            )
+
+            # RECORD THE FORECAST RUN, ITS PREDICTIONS AND METRICS IN ONE ROUND TRIP
+            forecast_run = dict(
+                run_id=current_run_id, meter_id=self.meter_id, model_name=model_to_use,
+                prediction_start_time=prediction_start_time, prediction_end_time=prediction_end_time,
+                predictions_data=predictions_to_store,
+                training_data_start=training_data_start, training_data_end=training_data_end,
+                mae=metrics.get('mae'), rmse=metrics.get('rmse')
+            )
+            if pending_runs is not None:
+                pending_runs.append(forecast_run)
+            else:
+                db_manager.insert_forecast_run_with_predictions(**forecast_run)
+        else:
+            # JOIN ACTUALS, EVALUATE AND RECORD THE RUN INSIDE POSTGRESQL
+            server_metrics = db_manager.insert_forecast_run_joining_actuals(
+                run_id=current_run_id, meter_id=self.meter_id, model_name=model_to_use,
+                prediction_start_time=prediction_start_time, prediction_end_time=prediction_end_time,
+                predictions_data=simulated_readings_output,
+                training_data_start=training_data_start, training_data_end=training_data_end
+            )
+            metrics = {key: float('nan') if value is None else value for key, value in server_metrics.items()}
+            actuals_in_simulation_range = []
+        logger.info("Forecast run %s recorded.", current_run_id)
+
+        # RETURN COMPLETE RESULTS
         return {
             "meter_id": self.meter_id,
             "model_requested": model_name,
@@ -204,6 +578,84 @@ class DigitalTwin:
             "run_id": current_run_id
         }
 
+    def _simulation_cache_key(self, model_name: str, data_for_training_hours: int,
+                              event_data: Optional[Dict[str, Any]], include_actuals: bool,
+                              prediction_start_time: datetime, prediction_end_time: datetime,
+                              now_tz: Optional[datetime] = None) -> Optional[tuple]:
+        """
+        Builds the SIMULATION_RESULT_CACHE key for a backtest, or returns None if the
+        result should not be cached (no readings yet, or unhashable event data).
+        The key carries the latest timestamp and the count of the readings the backtest would
+        read, so new or back-filled readings in its windows produce a new key.
+        """
+        history_start, history_end = self._historical_window(data_for_training_hours, now_tz)
+        try:
+            _, latest_timestamp, reading_count = db_manager.get_meter_readings_range_bounds(
+                self.meter_id, min(history_start, prediction_start_time), max(history_end, prediction_end_time)
+            )
+        except Exception as e:
+            logger.warning("Could not check readings for Meter %s; not caching this backtest: %s", self.meter_id, e)
+            return None
+        if not reading_count:
+            return None
+        try:
+            event_key = tuple(sorted(event_data.items())) if event_data else None
+            key = (self.meter_id, model_name, data_for_training_hours, event_key, include_actuals,
+                   int(prediction_start_time.timestamp()), int(prediction_end_time.timestamp()),
+                   latest_timestamp.timestamp(), reading_count)
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+
+# Connections a fleet worker's pool may open: one simulation fetches its actuals while the
+# model predicts, so it needs at most two at once.
+FLEET_WORKER_POOL_MAX = 2
+
+def _run_fleet_member(meter_id: str, simulation_kwargs: Dict[str, Any], in_worker: bool = True) -> Dict[str, Any]:
+    """
+    Runs one meter's simulation for run_fleet(). Worker processes start without a connection
+    pool (connections cannot be shared across processes), so in a worker ('in_worker') each
+    opens its own on first use and keeps it for the later meters it is handed. That pool is
+    sized for one simulation at a time, so a fleet holds at most FLEET_WORKER_POOL_MAX
+    connections per worker. In the caller's own process the application's pool is used as is.
+    """
+    if in_worker:
+        db_manager.initialize_db_pool(minconn=1, maxconn=FLEET_WORKER_POOL_MAX)
+    try:
+        return DigitalTwin(meter_id).run_simulation(**simulation_kwargs)
+    except Exception as e:
+        logger.error("Fleet simulation failed for Meter %s: %s", meter_id, e, exc_info=logger.isEnabledFor(logging.DEBUG))
+        return {"meter_id": meter_id, "error": str(e)}
+
+def run_fleet(meter_ids: List[str], n_jobs: int = -1, **simulation_kwargs) -> List[Dict[str, Any]]:
+    """
+    Runs the same simulation for several meters in parallel worker processes (joblib's loky
+    backend, whose workers are reused across calls together with their pools and model caches).
+
+    Args:
+        meter_ids (List[str]): The meters to simulate.
+        n_jobs (int): Number of worker processes; -1 uses every core. Each worker holds up to
+                      FLEET_WORKER_POOL_MAX database connections, and no more workers than
+                      meters are started. With a single job (e.g. a single meter) the meters
+                      are simulated one after another in the calling process instead.
+        **simulation_kwargs: Arguments passed to DigitalTwin.run_simulation() for every meter.
+
+    Returns:
+        One result dictionary per meter, in the order given. A meter whose simulation failed
+        gets {'meter_id': ..., 'error': ...} instead, so one bad meter does not sink the fleet.
+    """
+    if not meter_ids:
+        return []
+    n_jobs = min(effective_n_jobs(n_jobs), len(meter_ids))
+    if n_jobs == 1:
+        # joblib would run these in this process too; keep its pool rather than a worker-sized one
+        return [_run_fleet_member(meter_id, simulation_kwargs, in_worker=False) for meter_id in meter_ids]
+    return Parallel(n_jobs=n_jobs, backend='loky')(
+        delayed(_run_fleet_member)(meter_id, simulation_kwargs) for meter_id in meter_ids
+    )
+
 
 if __name__ == '__main__':
     if not logging.getLogger().handlers:
@@ -227,7 +679,7 @@ if __name__ == '__main__':
 
         # --- Example of running a simulation for a PAST period ---
         # Get current time for setting a past window
-        now_tz = datetime.now(db_manager.get_timezone()).replace(second=0, microsecond=0) # Corrected
+        now_tz = datetime.now(_APP_TZ).replace(second=0, microsecond=0) # Corrected
         
         # Define a past 24-hour window (e.g., from 48 hours ago to 24 hours ago)
         # Adjust these timestamps based on when you know you have data from your scraper
@@ -260,10 +712,5 @@ if __name__ == '__main__':
     except Exception as e:
         logger.error(f"Error during DigitalTwin test with real DB: {e}", exc_info=True)
     finally:
-        try:
-            if db_manager.DB_POOL:
-                db_manager.close_db_pool()
-                logger.info("Database connection pool closed.")
-        except Exception as e:
-            logger.error(f"Error closing DB pool: {e}")
+        db_manager.close_db_pool() # No-op if the pool was never created; logs its own errors
 
@@ -1,8 +1,12 @@
+import importlib
 import logging
-import os
-from abc import ABC, abstractmethod
+import sys
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Type, Tuple, Union # Ensure these are imported
+from typing import Dict, Any, List, Type
+
+import numpy as np
+import pandas as pd
+
 from src.models.base_model import BaseForecastingModel
 
 # --- Logging Setup ---
@@ -12,35 +16,36 @@ logger = logging.getLogger(__name__)
 #logger.setLevel(logging.INFO)
 
 
-# In src/forecasting_engine.py
-
-import importlib
-import logging
-from typing import Dict, List, Any, Type
-
-import numpy as np
-import pandas as pd
-from sklearn.metrics import mean_absolute_error, mean_squared_error
-
-from src.models.base_model import BaseForecastingModel
-
-logger = logging.getLogger(__name__)
+# Model classes resolved so far, keyed by model name. Filled lazily by get_model_class() so that
+# heavy model modules (e.g., TensorFlow for 'dl_model') are only imported when first requested.
+MODEL_REGISTRY: Dict[str, Type[BaseForecastingModel]] = {}
+# Model names whose module does not exist, so repeated requests for an unknown model are rejected
+# without searching the import path (and logging the traceback) again
+_UNRESOLVED_MODELS = set()
 
 
-def load_forecasting_model(model_name: str) -> BaseForecastingModel:
+def get_model_class(model_name: str) -> Type[BaseForecastingModel]:
     """
-    Dynamically imports and instantiates a forecasting model from the src/models directory.
+    Resolves the forecasting model class for a model name without instantiating it, importing
+    its module from the src/models directory on first use.
 
     Args:
         model_name (str): The underscore-separated name of the model file
                           (e.g., 'baseline_model', 'dl_model').
 
     Returns:
-        An instance of the requested forecasting model.
-    
+        The model class (e.g., BaselineModel). Class-level information such as
+        get_required_history_count() can be read from it directly.
+
     Raises:
         ValueError: If the model module or class cannot be found.
     """
+    model_class = MODEL_REGISTRY.get(model_name)
+    if model_class is not None:
+        return model_class
+    if model_name in _UNRESOLVED_MODELS:
+        raise ValueError(f"Forecasting model '{model_name}' not found or incorrectly implemented.")
+
     try:
         # --- THIS IS THE LOGIC TO FIX ---
         
@@ -58,27 +63,61 @@ def load_forecasting_model(model_name: str) -> BaseForecastingModel:
         
         # Dynamically import the module (e.g., src.models.baseline_model)
         module_path = f"src.models.{model_name}"
+        # import_module() returns an already loaded module cheaply, and waits on the module lock
+        # while another thread is still importing it (e.g. TensorFlow for 'dl_model')
         module = importlib.import_module(module_path)
         
         # Get the class from the imported module
-        model_class: Type[BaseForecastingModel] = getattr(module, class_name)
-        
-        # Instantiate and return the model class
-        logger.info(f"Successfully loaded and instantiated model '{class_name}' from '{module_path}'.")
-        return model_class()
-
-    except ImportError:
-        logger.error(f"Could not import module for model '{model_name}'. Ensure '{model_name}.py' exists in 'src/models/'.", exc_info=True)
+        model_class = getattr(module, class_name)
+
+    except ImportError as e:
+        # Only a missing model module is remembered; an ImportError raised while importing it
+        # (e.g. a missing optional dependency) may be fixed without renaming the model
+        if isinstance(e, ModuleNotFoundError) and e.name == module_path:
+            _UNRESOLVED_MODELS.add(model_name)
+        logger.error("Could not import module for model '%s'. Ensure '%s.py' exists in 'src/models/'.", model_name, model_name, exc_info=True)
         raise ValueError(f"Forecasting model '{model_name}' not found or incorrectly implemented.")
     except AttributeError:
         logger.error(
-            f"Could not load forecasting model '{model_name}'. "
-            f"Ensure '{model_name}.py' exists in 'src/models/' and contains a class named '{class_name}'",
+            "Could not load forecasting model '%s'. "
+            "Ensure '%s.py' exists in 'src/models/' and contains a class named '%s'",
+            model_name, model_name, class_name,
             exc_info=True
         )
         raise ValueError(f"Forecasting model '{model_name}' not found or incorrectly implemented.")
+
+    MODEL_REGISTRY[model_name] = model_class
+    return model_class
+
+
+def clear_model_registry():
+    """Forgets resolved and unresolved model names, e.g. after a model file was added."""
+    MODEL_REGISTRY.clear()
+    _UNRESOLVED_MODELS.clear()
+
+
+def load_forecasting_model(model_name: str) -> BaseForecastingModel:
+    """
+    Dynamically imports and instantiates a forecasting model from the src/models directory.
+
+    Args:
+        model_name (str): The underscore-separated name of the model file
+                          (e.g., 'baseline_model', 'dl_model').
+
+    Returns:
+        An instance of the requested forecasting model.
+    
+    Raises:
+        ValueError: If the model module or class cannot be found.
+    """
+    model_class = get_model_class(model_name)
+    try:
+        # Instantiate and return the model class
+        model_instance = model_class()
+        logger.info("Successfully loaded and instantiated model '%s' from '%s'.", model_class.__name__, model_class.__module__)
+        return model_instance
     except Exception as e:
-        logger.error(f"An unexpected error occurred while loading model '{model_name}': {e}", exc_info=True)
+        logger.error("An unexpected error occurred while loading model '%s': %s", model_name, e, exc_info=True)
         raise
 
 def calculate_forecast_metrics(actuals: List[Dict[str, Any]], predictions: List[Dict[str, Any]]) -> Dict[str, float]:
@@ -95,31 +134,49 @@ def calculate_forecast_metrics(actuals: List[Dict[str, Any]], predictions: List[
         Dict[str, float]: A dictionary containing 'mae' and 'rmse'.
                           Returns NaN if no overlapping data points.
     """
-    actual_map = {a['timestamp']: a['energy_kwh_import'] for a in actuals}
-    aligned_predictions = []
-    aligned_actuals = []
+    if not predictions or not actuals:
+        return calculate_forecast_metrics_from_arrays(np.empty(0), np.empty(0))
+
+    # Both lists are time-ordered, so each prediction's actual is found by one vectorized binary
+    # search over int64 epoch nanoseconds (the first actual on an equal timestamp wins)
+    actual_ns = pd.to_datetime([a['timestamp'] for a in actuals], utc=True).asi8
+    pred_ns = pd.to_datetime([p['timestamp'] for p in predictions], utc=True).asi8
+    idx = np.searchsorted(actual_ns, pred_ns)
+    np.minimum(idx, actual_ns.size - 1, out=idx)
+    matched = actual_ns[idx] == pred_ns
+
+    # Only the matched readings are converted (actuals are often denser than the predictions)
+    matched_idx = idx[matched].tolist()
+    actual_values = np.fromiter((np.nan if actuals[i]['energy_kwh_import'] is None else actuals[i]['energy_kwh_import']
+                                 for i in matched_idx), dtype=np.float64, count=len(matched_idx))
+    predicted_values = np.fromiter((p['predicted_kwh'] for p in predictions), dtype=np.float64, count=len(predictions))
+    return calculate_forecast_metrics_from_arrays(actual_values, predicted_values[matched])
+
+
+def calculate_forecast_metrics_from_arrays(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, float]:
+    """
+    Calculates MAE and RMSE from two aligned float64 arrays in vectorized NumPy operations.
+    Positions where either value is NaN (e.g., a prediction without an actual reading) are ignored.
 
-    # Iterate through predictions and find corresponding actuals
-    for p in predictions:
-        if p['timestamp'] in actual_map:
-            aligned_predictions.append(p['predicted_kwh'])
-            aligned_actuals.append(actual_map[p['timestamp']])
+    Returns:
+        Dict[str, float]: A dictionary containing 'mae' and 'rmse'.
+                          Returns NaN if no position has both values.
+    """
+    errors = np.subtract(actual, predicted, dtype=np.float64)
+    valid = np.isnan(errors)
+    np.logical_not(valid, out=valid)
+    errors = errors[valid] # A fresh array, so it can be modified in place below
 
-    if not aligned_actuals:
+    if errors.size == 0:
         logger.warning("No overlapping timestamps between actuals and predictions for metric calculation.")
         return {"mae": float('nan'), "rmse": float('nan')}
 
-    # Calculate errors
-    errors = [float(a) - float(p) for a, p in zip(aligned_actuals, aligned_predictions)] # Cast to float for math
-    abs_errors = [abs(e) for e in errors]
-    squared_errors = [e**2 for e in errors]
-
-    # Calculate MAE
-    mae = sum(abs_errors) / len(abs_errors) if abs_errors else float('nan')
-    # Calculate RMSE
-    rmse = (sum(squared_errors) / len(squared_errors))**0.5 if squared_errors else float('nan')
+    # errors . errors is the sum of squares in one BLAS pass, without a squared temporary array;
+    # the absolute values then overwrite the errors instead of allocating another array
+    rmse = float(np.sqrt(np.dot(errors, errors) / errors.size))
+    mae = float(np.abs(errors, out=errors).sum() / errors.size)
 
-    logger.info(f"Calculated metrics: MAE={mae:.2f}, RMSE={rmse:.2f} (from {len(aligned_actuals)} points).")
+    logger.info("Calculated metrics: MAE=%.2f, RMSE=%.2f (from %d points).", mae, rmse, errors.size)
     return {"mae": mae, "rmse": rmse}
 
 
@@ -192,7 +249,6 @@ if __name__ == '__main__':
     try:
         # Temporarily register the MockBaselineModel in sys.modules
         # so load_forecasting_model can find it during this test
-        import sys
         sys.modules['src.models.mock_baseline_model_for_test'] = sys.modules['__main__']
         setattr(sys.modules['__main__'], 'MockBaselineModel', MockBaselineModel)
 
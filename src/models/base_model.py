@@ -1,14 +1,74 @@
 # src/models/base_model.py
 
+import copy
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Numeric reading columns carried into the model frame, and their names there. The models'
+# features only derive from the target and the timestamp (plus weather), so voltage and
+# current are neither fetched nor converted for them.
+READING_FRAME_COLUMNS = {
+    'energy_kwh_import': 'kwh',
+}
+
+# Models accept history either as fetched (list of reading dicts) or as built by readings_to_frame
+HistoricalData = Union[List[Dict[str, Any]], pd.DataFrame]
+
+def readings_to_frame(readings: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Converts reading dicts into a columnar DataFrame indexed by UTC timestamp, with one
+    float64 array per numeric column (None becomes NaN). Building it once per simulation
+    lets train() and predict() share it instead of each re-parsing the list of dicts.
+    """
+    if not readings:
+        return pd.DataFrame()
+    index = pd.DatetimeIndex(pd.to_datetime([r['timestamp'] for r in readings], utc=True), name='timestamp')
+    columns = {
+        target: np.fromiter((np.nan if r[source] is None else r[source] for r in readings),
+                            dtype=np.float64, count=len(readings))
+        for source, target in READING_FRAME_COLUMNS.items() if source in readings[0]
+    }
+    frame = pd.DataFrame(columns, index=index)
+    # Readings arrive ORDER BY timestamp ASC, so the sort is only a fallback for unordered input
+    return frame if index.is_monotonic_increasing else frame.sort_index()
+
+def reading_columns_to_frame(columns: Dict[str, List[Any]]) -> pd.DataFrame:
+    """
+    Builds the same DataFrame as readings_to_frame from column-oriented readings (one list per
+    column, e.g. from db_manager.get_meter_readings_columns), converting each column in a
+    single NumPy call instead of walking per-row dicts.
+    """
+    if not columns.get('timestamp'):
+        return pd.DataFrame()
+    index = pd.DatetimeIndex(pd.to_datetime(columns['timestamp'], utc=True), name='timestamp')
+    data = {
+        target: np.asarray(columns[source], dtype=np.float64)  # None becomes NaN
+        for source, target in READING_FRAME_COLUMNS.items() if source in columns
+    }
+    frame = pd.DataFrame(data, index=index)
+    return frame if index.is_monotonic_increasing else frame.sort_index()
+
+def forecast_records(timestamps: pd.DatetimeIndex, predicted_kwh: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Converts the (timestamps, predicted_kwh) pair returned by predict_arrays() into the
+    list of {'timestamp', 'predicted_kwh'} dicts returned by predict(), converting each
+    array to Python objects in one call.
+    """
+    return [{'timestamp': ts, 'predicted_kwh': kwh}
+            for ts, kwh in zip(timestamps.to_pydatetime(), np.asarray(predicted_kwh, dtype=np.float64).tolist())]
 
 class BaseForecastingModel(ABC):
     """
     Abstract Base Class for all forecasting models in the digital twin.
     It defines the standard interface that all models must implement.
     """
+    # Minimum number of historical records needed to predict; overridden by subclasses
+    REQUIRED_HISTORY = 1
+
     def __init__(self, model_name: str):
         self.model_name = model_name
 
@@ -18,12 +78,12 @@ class BaseForecastingModel(ABC):
 
     # --- MODIFIED: Added the optional event_data parameter ---
     @abstractmethod
-    def train(self, historical_data: List[Dict[str, Any]], event_data: Optional[Dict[str, Any]] = None):
+    def train(self, historical_data: HistoricalData, event_data: Optional[Dict[str, Any]] = None):
         """
         Trains or prepares the model using historical data.
 
         Args:
-            historical_data: A list of past meter readings.
+            historical_data: Past meter readings, as a list of dicts or a readings_to_frame() DataFrame.
             event_data (Optional): A dictionary describing a simulated event to apply
                                    before training, e.g., for 'holiday_shutdown'.
         """
@@ -34,7 +94,7 @@ class BaseForecastingModel(ABC):
     def predict(self,
                 start_timestamp: datetime,
                 end_timestamp: datetime,
-                historical_data: List[Dict[str, Any]],
+                historical_data: HistoricalData,
                 frequency: timedelta,
                 event_data: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
@@ -43,16 +103,45 @@ class BaseForecastingModel(ABC):
         Args:
             start_timestamp: The beginning of the prediction period.
             end_timestamp: The end of the prediction period.
-            historical_data: A list of past meter readings to create initial features.
-            frequency: The time interval between predictions.
+            historical_data: Past meter readings to create initial features
+                             (a list of dicts or a readings_to_frame() DataFrame).
+            frequency: The time interval between predictions. Implementations build the
+                       prediction timestamps with a single pd.date_range() call over
+                       [start_timestamp, end_timestamp], not a Python loop adding 'frequency'.
             event_data (Optional): A dictionary describing a simulated event to apply,
                                    e.g., for a 'heatwave'.
         """
         pass
 
-    def get_required_history_count(self) -> int:
+    def predict_arrays(self,
+                       start_timestamp: datetime,
+                       end_timestamp: datetime,
+                       historical_data: HistoricalData,
+                       frequency: timedelta,
+                       event_data: Optional[Dict[str, Any]] = None) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """
+        Same forecast as predict(), returned as a DatetimeIndex of prediction timestamps and a
+        float64 array of predicted kWh, without a dict per point. This default converts the
+        output of predict(); models that compute arrays natively override it and build
+        predict() from it with forecast_records().
+        """
+        records = self.predict(start_timestamp, end_timestamp, historical_data, frequency, event_data=event_data)
+        timestamps = pd.DatetimeIndex([r['timestamp'] for r in records])
+        predicted_kwh = np.fromiter((r['predicted_kwh'] for r in records), dtype=np.float64, count=len(records))
+        return timestamps, predicted_kwh
+
+    @classmethod
+    def get_required_history_count(cls) -> int:
         """
         Returns the minimum number of historical records required for this
         model to make a prediction. Default is 1 for simple models.
+        A classmethod, so it can be checked without constructing (and loading) the model.
+        """
+        return cls.REQUIRED_HISTORY
+
+    def clone(self) -> 'BaseForecastingModel':
+        """
+        Returns an independent, untrained copy of this model. Loaded model instances are cached
+        and reused as templates, so train() must always run on a clone.
         """
-        return 1
\ No newline at end of file
+        return copy.deepcopy(self)
\ No newline at end of file
@@ -2,11 +2,12 @@
 
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestRegressor
-from src.models.base_model import BaseForecastingModel
+from src.models.base_model import BaseForecastingModel, HistoricalData, forecast_records, readings_to_frame
 from src.weather_client import get_weather_data
 from src.config_loader import get_location_config
 
@@ -18,6 +19,8 @@ MODEL_FEATURES = [
     'temp', 'humidity', 'dew_point', 'precipitation', 'cloud_cover_code'
 ]
 TARGET_COLUMN = 'kwh'
+# Features derived from the timestamp alone; the rest of MODEL_FEATURES come from the weather data
+CALENDAR_FEATURES = ['hour', 'dayofweek', 'quarter', 'month', 'year', 'dayofyear', 'dayofmonth', 'weekofyear']
 
 class BaselineModel(BaseForecastingModel):
     """
@@ -31,26 +34,30 @@ class BaselineModel(BaseForecastingModel):
         self.is_trained = False
         logger.info("Initialized Weather-Aware ML Baseline (Random Forest).")
 
-    def _prepare_dataframe(self, data: List[Dict[str, Any]]) -> pd.DataFrame:
-        if not data:
-            return pd.DataFrame()
-        df = pd.DataFrame(data)
-        df.rename(columns={'energy_kwh_import': TARGET_COLUMN}, inplace=True)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
-        df = df.set_index('timestamp').sort_index()
-        return df
+    def _prepare_dataframe(self, data: HistoricalData) -> pd.DataFrame:
+        # Frames from readings_to_frame are used as-is; they are never modified in place
+        if isinstance(data, pd.DataFrame):
+            return data
+        return readings_to_frame(data)
 
     def _create_features(self, df: pd.DataFrame, event_data: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
-        df_featured = df.copy()
+        # 'df' may be a cached history frame, so it is never modified. Instead of copying it up
+        # front, every step below that changes the frame rebinds df_featured to a new one
+        # (set_axis, tz_convert, drop, join, concat), and columns are only written in place
+        # once the concat has produced a frame of our own.
+        df_featured = df
 
         if not isinstance(df_featured.index, pd.DatetimeIndex):
             if df_featured.empty: return df_featured
-            df_featured.index = pd.to_datetime(df_featured.index, utc=True)
+            df_featured = df_featured.set_axis(pd.to_datetime(df_featured.index, utc=True), axis=0)
         
-        df_featured = df_featured.tz_convert('UTC')
+        if str(df_featured.index.tz) != 'UTC':
+            df_featured = df_featured.tz_convert('UTC')
         
-        weather_cols = [col for col in MODEL_FEATURES if col not in ['hour', 'dayofweek', 'quarter', 'month', 'year', 'dayofyear', 'dayofmonth', 'weekofyear']]
-        df_featured.drop(columns=[col for col in weather_cols if col in df_featured.columns], inplace=True, errors='ignore')
+        weather_cols = [col for col in MODEL_FEATURES if col not in CALENDAR_FEATURES]
+        stale_cols = [col for col in weather_cols + CALENDAR_FEATURES if col in df_featured.columns]
+        if stale_cols:
+            df_featured = df_featured.drop(columns=stale_cols)
 
         try:
             if not df_featured.empty:
@@ -65,23 +72,29 @@ class BaselineModel(BaseForecastingModel):
         except Exception as e:
             logger.error(f"BaselineModel: Weather integration failed: {e}.")
 
+        # The calendar features (and zeros for any weather column the join did not provide) are
+        # built into one new frame and attached in a single concat, instead of inserting one
+        # column at a time. Calendar ranges are small, so they are stored as int8/int16.
+        index = df_featured.index
+        new_features = {
+            'hour': index.hour.to_numpy(dtype=np.int8),
+            'dayofweek': index.dayofweek.to_numpy(dtype=np.int8),
+            'quarter': index.quarter.to_numpy(dtype=np.int8),
+            'month': index.month.to_numpy(dtype=np.int8),
+            'year': index.year.to_numpy(dtype=np.int16),
+            'dayofyear': index.dayofyear.to_numpy(dtype=np.int16),
+            'dayofmonth': index.day.to_numpy(dtype=np.int8),
+            'weekofyear': index.isocalendar().week.to_numpy(dtype=np.int8),
+        }
         for col in weather_cols:
             if col not in df_featured.columns:
-                df_featured[col] = 0.0
+                new_features[col] = np.zeros(len(index))
+        df_featured = pd.concat([df_featured, pd.DataFrame(new_features, index=index)], axis=1)
         
         if event_data:
             event_type, value = event_data.get('type'), event_data.get('value')
             if event_type == 'heatwave' and value is not None: df_featured['temp'] += value
             elif event_type == 'cold_snap' and value is not None: df_featured['temp'] -= value
-
-        df_featured['hour'] = df_featured.index.hour
-        df_featured['dayofweek'] = df_featured.index.dayofweek
-        df_featured['quarter'] = df_featured.index.quarter
-        df_featured['month'] = df_featured.index.month
-        df_featured['year'] = df_featured.index.year
-        df_featured['dayofyear'] = df_featured.index.dayofyear
-        df_featured['dayofmonth'] = df_featured.index.day
-        df_featured['weekofyear'] = df_featured.index.isocalendar().week.astype(int)
         
         df_featured.ffill(inplace=True)
         df_featured.bfill(inplace=True)
@@ -93,8 +106,8 @@ class BaselineModel(BaseForecastingModel):
 
         return df_featured
 
-    def train(self, historical_data: List[Dict[str, Any]], event_data: Optional[Dict[str, Any]] = None):
-        if not historical_data:
+    def train(self, historical_data: HistoricalData, event_data: Optional[Dict[str, Any]] = None):
+        if len(historical_data) == 0:
             self.is_trained = False; return
         try:
             df = self._prepare_dataframe(historical_data)
@@ -105,7 +118,9 @@ class BaselineModel(BaseForecastingModel):
 
             df_featured = self._create_features(df, event_data=event_data)
             
-            X_train = df_featured[MODEL_FEATURES]
+            # RandomForestRegressor works on float32 features internally; handing it float32
+            # avoids the float64 intermediate and its conversion copy
+            X_train = df_featured[MODEL_FEATURES].to_numpy(dtype=np.float32)
             y_train = df_featured[TARGET_COLUMN]
 
             self.model.fit(X_train, y_train)
@@ -115,18 +130,23 @@ class BaselineModel(BaseForecastingModel):
             self.is_trained = False
 
     def predict(self, start_timestamp: datetime, end_timestamp: datetime,
-                historical_data: List[Dict[str, Any]], frequency: timedelta,
+                historical_data: HistoricalData, frequency: timedelta,
                 event_data: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        if not self.is_trained: return []
+        return forecast_records(*self.predict_arrays(start_timestamp, end_timestamp, historical_data,
+                                                     frequency, event_data=event_data))
+
+    def predict_arrays(self, start_timestamp: datetime, end_timestamp: datetime,
+                       historical_data: HistoricalData, frequency: timedelta,
+                       event_data: Optional[Dict[str, Any]] = None) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        if not self.is_trained: return pd.DatetimeIndex([]), np.empty(0, dtype=np.float64)
 
         # --- FIX: Removed the tz='UTC' argument. Pandas will infer it from the start/end times. ---
         future_dates = pd.date_range(start=start_timestamp, end=end_timestamp, freq=frequency)
         future_df = pd.DataFrame(index=future_dates)
         
         future_df_featured = self._create_features(future_df, event_data=event_data)
-        X_future = future_df_featured[MODEL_FEATURES]
+        X_future = future_df_featured[MODEL_FEATURES].to_numpy(dtype=np.float32)
 
         predicted_values = self.model.predict(X_future)
         
-        return [{'timestamp': ts.to_pydatetime(), 'predicted_kwh': float(pred)}
-                for ts, pred in zip(future_df.index, predicted_values)]
\ No newline at end of file
+        return future_dates, np.asarray(predicted_values, dtype=np.float64)
\ No newline at end of file
@@ -3,13 +3,14 @@
 import pandas as pd
 import numpy as np
 import joblib
+import copy
 import tensorflow as tf
 import os
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
-from src.models.base_model import BaseForecastingModel
+from src.models.base_model import BaseForecastingModel, HistoricalData, forecast_records, readings_to_frame
 from src.weather_client import get_weather_data
 from src.config_loader import get_location_config
 
@@ -31,14 +32,18 @@ TARGET_COLUMN = 'kwh'
 TARGET_COLUMN_INDEX = MODEL_FEATURES.index(TARGET_COLUMN)
 
 class DlModel(BaseForecastingModel):
+    REQUIRED_HISTORY = REQUIRED_HISTORY_FOR_FEATURES
+
     def __init__(self):
         super().__init__("dl_model") 
         self.model = None
         self.scaler = None
         self._load_artifacts()
 
-    def get_required_history_count(self) -> int:
-        return REQUIRED_HISTORY_FOR_FEATURES
+    def clone(self) -> 'DlModel':
+        # The pre-trained network and scaler are only read, so copies share them
+        # instead of reloading (or deep-copying) the artifacts.
+        return copy.copy(self)
 
     def _load_artifacts(self):
         logger.info("DLModel: Loading pre-trained model and scaler...")
@@ -49,12 +54,10 @@ class DlModel(BaseForecastingModel):
             logger.error(f"DLModel ERROR: Could not load artifacts: {e}")
             raise
 
-    def _prepare_dataframe(self, data: List[Dict[str, Any]]) -> pd.DataFrame:
-        if not data: return pd.DataFrame()
-        df = pd.DataFrame(data)
-        df.rename(columns={'energy_kwh_import': TARGET_COLUMN}, inplace=True)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
-        df = df.set_index('timestamp').sort_index()
+    def _prepare_dataframe(self, data: HistoricalData) -> pd.DataFrame:
+        df = data if isinstance(data, pd.DataFrame) else readings_to_frame(data)
+        if df.empty: return df
+        # asfreq() returns a new frame, so a shared input frame is left untouched
         df = df.asfreq('30min').interpolate(method='linear')
         return df
         
@@ -115,23 +118,31 @@ class DlModel(BaseForecastingModel):
 
         return df_featured
 
-    def train(self, historical_data: List[Dict[str, Any]], event_data: Optional[Dict[str, Any]] = None):
+    def train(self, historical_data: HistoricalData, event_data: Optional[Dict[str, Any]] = None):
         if event_data:
-            logger.info(f"Applying event {event_data} to historical context for DL model.")
+            logger.info("Applying event %s to historical context for DL model.", event_data)
         pass
 
     def predict(self, start_timestamp: datetime, end_timestamp: datetime,
-                historical_data: List[Dict[str, Any]], frequency: timedelta,
+                historical_data: HistoricalData, frequency: timedelta,
                 event_data: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        return forecast_records(*self.predict_arrays(start_timestamp, end_timestamp, historical_data,
+                                                     frequency, event_data=event_data))
+
+    def predict_arrays(self, start_timestamp: datetime, end_timestamp: datetime,
+                       historical_data: HistoricalData, frequency: timedelta,
+                       event_data: Optional[Dict[str, Any]] = None) -> Tuple[pd.DatetimeIndex, np.ndarray]:
         if len(historical_data) < self.get_required_history_count():
-            return []
+            return pd.DatetimeIndex([]), np.empty(0, dtype=np.float64)
 
         history_df = self._prepare_dataframe(historical_data)
         history_df_with_events = self._create_features(history_df, event_data)
         
         # --- FIX: Removed the conflicting tz='UTC' argument ---
         future_datetimes = pd.date_range(start=start_timestamp, end=end_timestamp, freq=frequency)
-        predictions_list = []
+        # Each step feeds on the previous prediction, so the loop stays; its outputs are collected
+        # as plain values and converted to arrays once at the end
+        predicted_timestamps, predicted_kwh = [], []
 
         for dt in future_datetimes:
             feature_base_df = history_df_with_events.tail(REQUIRED_HISTORY_FOR_FEATURES).copy()
@@ -156,11 +167,9 @@ class DlModel(BaseForecastingModel):
             prediction_kwh = self.scaler.inverse_transform(dummy_pred)[0, TARGET_COLUMN_INDEX]
             
             prediction_kwh = max(0, prediction_kwh)
-            predictions_list.append({
-                'timestamp': dt.to_pydatetime(),
-                'predicted_kwh': float(prediction_kwh)
-            })
+            predicted_timestamps.append(dt)
+            predicted_kwh.append(prediction_kwh)
             
             history_df_with_events.loc[dt] = {'kwh': prediction_kwh}
 
-        return predictions_list
\ No newline at end of file
+        return pd.DatetimeIndex(predicted_timestamps), np.asarray(predicted_kwh, dtype=np.float64)
\ No newline at end of file
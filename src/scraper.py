@@ -29,6 +29,8 @@ os.makedirs(LOG_DIR, exist_ok=True)
 os.makedirs(SCREENSHOT_DIR, exist_ok=True)
 os.makedirs(PAGE_SOURCE_DIR, exist_ok=True)
 logger = logging.getLogger(__name__)
+# Resolved once: parse_datetime runs for every scraped reading
+_APP_TZ = db_manager.get_timezone()
 
 config = configparser.ConfigParser()
 config_path = os.path.join(BASE_DIR, 'config.ini')
@@ -110,7 +112,7 @@ def parse_datetime(dt_str):
     if not dt_str: return None
     try:
         naive_dt_object = datetime.strptime(dt_str, '%d/%m/%Y %H:%M')
-        return db_manager.get_timezone().localize(naive_dt_object)
+        return _APP_TZ.localize(naive_dt_object)
     except ValueError as e:
         logger.error(f"Failed to parse datetime string '{dt_str}': {e}. Returning None.")
         return None